@@ -1,7 +1,18 @@
 import os
 import json
+import threading
 import requests
-from typing import List, Set
+from typing import List, Optional, Set
+
+# Reading and updating the Gist happen back to back for every post, so keep the
+# connection to api.github.com alive between calls
+_gist_session = requests.Session()
+
+# Processed post IDs as last read from or written to the Gist. Posts are processed in
+# parallel, so updates are serialized under the lock and build on this copy instead of
+# re-reading the Gist each time, which could drop an ID another worker had just added
+_processed_post_ids: Optional[Set[str]] = None
+_processed_post_ids_lock = threading.Lock()
 
 
 def get_processed_post_ids() -> Set[str]:
@@ -9,12 +20,26 @@ def get_processed_post_ids() -> Set[str]:
     Retrieve the list of already processed post IDs from the GitHub Gist.
     Returns an empty set if the Gist is not accessible or doesn't contain valid data.
     """
+    global _processed_post_ids
+    post_ids = _fetch_processed_post_ids()
+    if post_ids is None:
+        return set()
+    with _processed_post_ids_lock:
+        _processed_post_ids = post_ids | (_processed_post_ids or set())
+    return post_ids
+
+
+def _fetch_processed_post_ids() -> Optional[Set[str]]:
+    """
+    Read the processed post IDs from the GitHub Gist.
+    Returns None if the Gist could not be read, as opposed to an empty set for an empty list.
+    """
     gist_token = os.getenv("GIST_TOKEN")
     gist_id = os.getenv("GIST_ID")
     
     if not gist_token or not gist_id:
         print("Warning: GIST_TOKEN or GIST_ID not found in environment variables")
-        return set()
+        return None
     
     try:
         headers = {
@@ -22,7 +47,7 @@ def get_processed_post_ids() -> Set[str]:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        response = requests.get(f"https://api.github.com/gists/{gist_id}", headers=headers)
+        response = _gist_session.get(f"https://api.github.com/gists/{gist_id}", headers=headers, timeout=10)
         response.raise_for_status()
         
         gist_data = response.json()
@@ -33,7 +58,7 @@ def get_processed_post_ids() -> Set[str]:
         
         if not post_ids_file:
             print("Warning: post_ids.json file not found in Gist")
-            return set()
+            return set()  # Nothing recorded yet
         
         content = post_ids_file.get("content", "{}")
         data = json.loads(content)
@@ -43,13 +68,13 @@ def get_processed_post_ids() -> Set[str]:
         
     except requests.RequestException as e:
         print(f"Error fetching Gist: {e}")
-        return set()
+        return None
     except json.JSONDecodeError as e:
         print(f"Error parsing Gist JSON: {e}")
-        return set()
+        return None
     except Exception as e:
         print(f"Unexpected error retrieving processed post IDs: {e}")
-        return set()
+        return None
 
 
 def add_processed_post_id(post_id: str) -> bool:
@@ -64,44 +89,55 @@ def add_processed_post_id(post_id: str) -> bool:
         print("Warning: GIST_TOKEN or GIST_ID not found in environment variables")
         return False
     
+    global _processed_post_ids
     try:
-        # First, get the current processed post IDs
-        current_post_ids = list(get_processed_post_ids())
+        with _processed_post_ids_lock:
+            # First, get the current processed post IDs (read from the Gist only once per run)
+            if _processed_post_ids is None:
+                fetched_post_ids = _fetch_processed_post_ids()
+                if fetched_post_ids is None:
+                    # Writing now would replace the whole list with just this ID
+                    print("Error updating Gist: could not read the current processed post IDs")
+                    return False
+                _processed_post_ids = fetched_post_ids
         
-        # Add the new post ID if it's not already there
-        if post_id not in current_post_ids:
-            current_post_ids.append(post_id)
+            # Add the new post ID if it's not already there
+            if post_id not in _processed_post_ids:
+                current_post_ids = list(_processed_post_ids)
+                current_post_ids.append(post_id)
             
-            # Prepare the updated content
-            updated_content = {
-                "post_ids": current_post_ids
-            }
+                # Prepare the updated content
+                updated_content = {
+                    "post_ids": current_post_ids
+                }
             
-            headers = {
-                "Authorization": f"token {gist_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "Content-Type": "application/json"
-            }
+                headers = {
+                    "Authorization": f"token {gist_token}",
+                    "Accept": "application/vnd.github.v3+json",
+                    "Content-Type": "application/json"
+                }
             
-            # Update the Gist
-            update_data = {
-                "files": {
-                    "post_ids.json": {
-                        "content": json.dumps(updated_content, indent=2)
+                # Update the Gist
+                update_data = {
+                    "files": {
+                        "post_ids.json": {
+                            "content": json.dumps(updated_content, indent=2)
+                        }
                     }
                 }
-            }
             
-            response = requests.patch(f"https://api.github.com/gists/{gist_id}", 
-                                    headers=headers, 
-                                    json=update_data)
-            response.raise_for_status()
+                response = _gist_session.patch(f"https://api.github.com/gists/{gist_id}", 
+                                                 headers=headers, 
+                                                 json=update_data,
+                                                 timeout=10)
+                response.raise_for_status()
+                _processed_post_ids.add(post_id)
             
-            #print(f"Successfully added post ID {post_id} to Gist")
-            return True
-        else:
-            print(f"Post ID {post_id} already exists in Gist")
-            return True
+                #print(f"Successfully added post ID {post_id} to Gist")
+                return True
+            else:
+                print(f"Post ID {post_id} already exists in Gist")
+                return True
             
     except requests.RequestException as e:
         print(f"Error updating Gist: {e}")
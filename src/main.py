@@ -1,5 +1,8 @@
 import argparse
-from concurrent.futures import ThreadPoolExecutor
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
 
 from cnapi.get_api_eligible_posts import get_posts_eligible_for_notes
@@ -8,9 +11,15 @@ from cnapi.submit_note import get_notes_written_by_user
 from cnapi.gist_util import get_processed_post_ids, add_processed_post_id
 from data_models import NoteResult, Post
 import dotenv
+from note_writer.llm_util import get_metrics
 from note_writer.write_note import research_post_and_write_note
 
 
+# Workers run in parallel; each post's summary is written in one go under this lock so
+# summaries of different posts never interleave
+_output_lock = threading.Lock()
+
+
 def _worker(
     post: Post,
     dry_run: bool = False,
@@ -20,8 +29,6 @@ def _worker(
     If `dry_run` is True, do not submit notes to the API, just print them to the console.
     """
     try:
-        print(f"\n--------------------Post: {post.post_id}--------------------")
-        
         note_result: NoteResult = research_post_and_write_note(post)
 
         log_strings: List[str] = []
@@ -83,24 +90,28 @@ def _worker(
                 log_strings.append("*GIST WARNING*: Failed to add post ID to processed list")
         
         # Print all the log strings for this post
-        print("\n".join(log_strings))
+        with _output_lock:
+            sys.stdout.write(f"\n--------------------Post: {post.post_id}--------------------\n" + "\n".join(log_strings) + "\n")
+            sys.stdout.flush()
         
     except Exception as e:
         # Catch any unhandled exceptions to prevent program termination
-        print(f"\n--------------------Post: {post.post_id}--------------------")
-        print(f"*CRITICAL ERROR*: Unhandled exception occurred while processing post: {str(e)}")
-        print(f"*SKIPPING POST*: Moving to next post to avoid program termination")
-        # Don't add to gist for unexpected errors as they might be temporary
-        
-        # Optionally log the full traceback for debugging
         import traceback
-        print(f"*FULL TRACEBACK*:\n{traceback.format_exc()}")
+        # Don't add to gist for unexpected errors as they might be temporary
+        with _output_lock:
+            sys.stdout.write(
+                f"\n--------------------Post: {post.post_id}--------------------\n"
+                f"*CRITICAL ERROR*: Unhandled exception occurred while processing post: {str(e)}\n"
+                "*SKIPPING POST*: Moving to next post to avoid program termination\n"
+                f"*FULL TRACEBACK*:\n{traceback.format_exc()}\n"
+            )
+            sys.stdout.flush()
 
 
 def main(
     num_posts: int = 5,
     dry_run: bool = False,
-    concurrency: int = 1,
+    concurrency: int = 4,
 ):
     """
     Get up to `num_posts` recent posts eligible for notes and write notes for them.
@@ -142,20 +153,22 @@ def main(
 
         if concurrency > 1:
             with ThreadPoolExecutor(max_workers=concurrency) as executor:
-                futures = [
-                    executor.submit(_worker, post, dry_run) for post in new_posts
-                ]
-                # Wait for all futures to complete and handle any exceptions
-                for i, future in enumerate(futures):
+                future_to_post = {
+                    executor.submit(_worker, post, dry_run): post for post in new_posts
+                }
+                # Handle workers as they finish, so a failure shows up right away
+                # instead of after every slower post submitted before it
+                for future in as_completed(future_to_post):
                     try:
                         future.result()  # This will raise any exception that occurred in the worker
                     except Exception as e:
-                        print(f"Exception in worker thread {i}: {e}")
+                        print(f"Exception in worker for post {future_to_post[future].post_id}: {e}")
                         # Continue processing other posts
         else:
             for post in new_posts:
                 _worker(post, dry_run)
         
+        print(f"\n📊 Run metrics: {get_metrics()}")
         print("\nDone.")
         
     except Exception as e:
@@ -180,10 +193,20 @@ if __name__ == "__main__":
     parser.add_argument(
         "--concurrency",
         type=int,
-        default=1,
-        help="Number of concurrent tasks to run",
+        default=4,
+        help="Number of posts to process concurrently. Gemini calls are rate limited and capped in flight "
+        "(NOTE_WRITER_GEMINI_MAX_INFLIGHT), so values far above the default mostly add queueing",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log rate limiting and search engine details",
     )
     args = parser.parse_args()
+    logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+    if args.verbose:
+        # Only our own modules; third-party debug output stays quiet
+        logging.getLogger("note_writer").setLevel(logging.DEBUG)
     main(
         num_posts=args.num_posts,
         dry_run=args.dry_run,
@@ -0,0 +1,62 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+# Directory for persistent caches; override with NOTE_WRITER_CACHE_DIR
+_cache_dir = os.getenv("NOTE_WRITER_CACHE_DIR", ".cache")
+
+
+class DiskCache:
+    """
+    Small persistent key/value cache backed by a SQLite file, so cached results
+    survive across runs. Values must be JSON-serializable; entries expire after
+    ttl_seconds and are removed lazily when read
+    """
+
+    def __init__(self, name: str, ttl_seconds: float):
+        os.makedirs(_cache_dir, exist_ok=True)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # One connection shared by all threads; the lock serializes access to it
+        self._connection = sqlite3.connect(
+            os.path.join(_cache_dir, f"{name}.sqlite"), check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, stored_at REAL, value TEXT)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT stored_at, value FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                stored_at, value = row
+                if time.time() - stored_at > self._ttl_seconds:
+                    with self._connection:
+                        self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    return None
+            return json.loads(value)
+        except Exception as e:
+            # A broken cache should never break the pipeline
+            print(f"⚠️ Disk cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        try:
+            serialized = json.dumps(value)
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, stored_at, value) VALUES (?, ?, ?)",
+                    (key, time.time(), serialized),
+                )
+        except Exception as e:
+            print(f"⚠️ Disk cache write failed: {e}")
@@ -1,272 +1,834 @@
+import contextlib
+import functools
+import hashlib
+import json
+import logging
 import os
+import queue
 import time
 import re
+import threading
 import requests
 import random
+from collections import Counter, OrderedDict
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Tuple, Any
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlsplit, urlunsplit
 
 import dotenv
+from bs4 import BeautifulSoup, SoupStrainer
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from note_writer.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
 
 # Configure Gemini API
 client = genai.Client()
+_gemini_model = 'gemini-2.5-flash'
+
+# Prefer the C-backed lxml parser when it is installed; fall back to the stdlib parser
+try:
+    import lxml  # type: ignore  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Only build tree nodes for the tags we actually read; everything else is skipped while parsing
+_METADATA_STRAINER = SoupStrainer(['title', 'meta', 'p'])
+
+# Messages the search engines return instead of results when they come up empty
+_SEARCH_FAILURE_RE = re.compile('|'.join(map(re.escape, [
+    "Web search error",  # General error
+    "Google search rate limited or no results found",  # Google
+    "No valid results found from Google search",  # Google
+    "No relevant news found in RSS feeds",  # RSS
+    "No articles found through web scraping",  # News Scraper
+])))
+
+# "Result X:" or "Result X (Priority: N):" headers in formatted search results
+_RESULT_HEADER_RE = re.compile(r'Result \d+(?:\s*\(Priority:\s*\d+\))?:')
+
+# Class names that usually mark article containers on news aggregator pages
+_ARTICLE_CLASS_RE = re.compile(r'(article|news|story|item)', re.I)
+_ARTICLE_STRAINER = SoupStrainer(['article', 'div'], class_=_ARTICLE_CLASS_RE)
+
+# Pattern to match URLs with various protocols and formats
+# Excludes common punctuation that might be at the end of URLs in text
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]()]+(?:\([^\s<>"{}|\\^`\[\]()]*\))?[^\s<>"{}|\\^`\[\]()]*|www\.[^\s<>"{}|\\^`\[\]()]+|[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.[a-zA-Z]{2,}(?:/[^\s<>"{}|\\^`\[\]()]*)?')
+# Trailing punctuation that's commonly at the end of sentences
+_TRAILING_PUNCT_RE = re.compile(r'[)\].,;:!?]+$')
+
+# Query term extraction: capitalized phrases (likely proper nouns), years and plain numbers,
+# all found in one scan and tagged by group name
+_QUERY_TERMS_RE = re.compile(
+    r'(?P<year>\b20[0-9]{2}\b)|(?P<cap>\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b)|(?P<num>\b\d+\b)'
+)
+
+# Shared HTTP session so repeated requests to the same host reuse connections
+# instead of paying a new TCP + TLS handshake on every call
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,  # Room for link verification and search fetches running in parallel
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        # No 429 here: a rate-limited scrape or feed just counts as a miss. A server's
+        # Retry-After is ignored too, so it can't park a worker thread for minutes
+        status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=False,
+        raise_on_status=False,  # Hand the final response back so callers can inspect the status
+    ),
+)
+_http_session.mount('https://', _http_adapter)
+_http_session.mount('http://', _http_adapter)
+# Dead hosts fail fast on connect; the per-call read timeout still bounds slow downloads
+_connect_timeout_seconds = 3
+_http_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
 
 # Rate limiting: Gemini free tier allows 15 requests per minute
-_last_request_time = 0
-_min_request_interval = 7  # 7 seconds between requests (8 requests per minute to be safe)
+_gemini_requests_per_minute = 15
+# The rate limiter paces when requests start; this caps how many are in flight at once, so posts,
+# images and link batches processed in parallel don't pile slow requests onto the API together
+_gemini_max_inflight = int(os.getenv("NOTE_WRITER_GEMINI_MAX_INFLIGHT", "8"))
+_gemini_inflight = threading.BoundedSemaphore(_gemini_max_inflight)
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: up to `capacity` requests can go out back to back while the
+    long-run rate stays at `refill_per_second`. The rate adapts AIMD-style: it is halved
+    whenever the API reports a rate limit and grows back by 10% after a run of successes
+    """
+
+    def __init__(self, capacity: int, refill_per_second: float,
+                 min_factor: float = 0.1, recovery_successes: int = 100):
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._min_factor = min_factor
+        self._recovery_successes = recovery_successes
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._factor = 1.0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        # Callers hold the lock
+        now = time.monotonic()
+        rate = self._refill_per_second * self._factor
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+        return rate
+
+    def reserve(self) -> float:
+        """Take a token, going into debt if none is left, and return how long to wait before using it"""
+        with self._lock:
+            rate = self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / rate
+
+    def record_success(self):
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self._recovery_successes:
+                self._refill()
+                self._factor = min(1.0, self._factor + 0.1)
+                self._successes = 0
+
+    def record_rate_limited(self):
+        with self._lock:
+            self._refill()
+            self._factor = max(self._min_factor, self._factor * 0.5)
+            self._successes = 0
+            # The server-side quota is spent, so don't let a saved-up burst go out right away
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def factor(self) -> float:
+        return self._factor
+
+
+_gemini_rate_limiter = _TokenBucket(_gemini_requests_per_minute, _gemini_requests_per_minute / 60)
 
 # Simple cache for search results to avoid duplicate API calls
-_search_cache = {}
-_cache_expiry_seconds = 300  # 5 minutes
+_cache_expiry_seconds = int(os.getenv("NOTE_WRITER_SEARCH_CACHE_TTL", "300"))  # 5 minutes
+# Hard cap per cache so memory stays bounded no matter how many unique queries arrive;
+# least recently used entries are evicted first once the cache is full
+_cache_max_entries = int(os.getenv("NOTE_WRITER_CACHE_MAX_ENTRIES", "512"))
+
+
+class _TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire lazily when they are read,
+    so lookups never have to sweep the whole cache. An optional DiskCache
+    backing keeps entries across runs: misses are looked up there, and
+    writes go through to it unless persist=False
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, backing: Optional[DiskCache] = None):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._backing = backing
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                timestamp, value = entry
+                if time.time() - timestamp <= self._ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+        if self._backing is None:
+            return None
+        value = self._backing.get(key)
+        if value is not None:
+            self._set_in_memory(key, value)
+        return value
+
+    def set(self, key, value, persist: bool = True):
+        self._set_in_memory(key, value)
+        if persist and self._backing is not None:
+            self._backing.set(key, value)
+
+    def _set_in_memory(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def _persistent_cache(name: str, ttl_seconds: float) -> Optional[DiskCache]:
+    """
+    DiskCache used to keep results across runs, or None unless opted in with NOTE_WRITER_HTTP_CACHE=1
+    """
+    return DiskCache(name, ttl_seconds) if os.getenv("NOTE_WRITER_HTTP_CACHE") == "1" else None
+
+
+# Search results also persist across runs with NOTE_WRITER_HTTP_CACHE=1, under the same TTL
+_search_cache = _TTLCache(_cache_max_entries, _cache_expiry_seconds,
+                          backing=_persistent_cache("search", _cache_expiry_seconds))
+
+# Completed Gemini responses keyed by a deterministic idempotency key, so a repeated
+# or retried identical request is answered locally instead of spending quota again.
+# Low-temperature responses (link validation runs at 0.3) are close to deterministic, so with
+# NOTE_WRITER_HTTP_CACHE=1 they are also kept on disk and a rerun doesn't pay for them again
+_persistent_response_max_temperature = 0.3
+_response_cache = _TTLCache(_cache_max_entries, 600,  # 10 minutes
+                            backing=_persistent_cache("gemini_responses", 7 * 86400))
+
+# Search-grounded answers keyed on the prompt before web results are added, so a post researched
+# again the same day (e.g. one refused for lack of evidence on the previous run) skips both the
+# web search and the Gemini call. Kept for a day at most, since current events move quickly
+_search_response_ttl_seconds = 86400
+_search_response_cache = _TTLCache(_cache_max_entries, _search_response_ttl_seconds,
+                                   backing=_persistent_cache("search_responses", _search_response_ttl_seconds))
+
+# Link validation verdicts, so a page seen again for the same claim skips the Gemini round-trip
+# The key covers the page snippet itself, so with NOTE_WRITER_HTTP_CACHE=1 verdicts can safely
+# be kept on disk for a day: a page whose content changed simply gets a new key
+_validation_cache = _TTLCache(_cache_max_entries, 3600,  # 1 hour
+                              backing=_persistent_cache("validations", 86400))
+
+# Time a search engine gets on its own before the next one is also started, and the overall
+# limit after which a search gives up on engines that are still running
+_engine_time_budget_seconds = int(os.getenv("NOTE_WRITER_SEARCH_ENGINE_BUDGET", "20"))
+_search_deadline_seconds = 90
+
+# Aggregate counters for cache hits, engine outcomes, rate limit waits, etc.
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+# Exponentially weighted latency / success rate per search engine, used to start
+# the currently healthy and fast engines first
+_engine_stats: Dict[str, Dict[str, float]] = {}
+_engine_stats_alpha = 0.3  # Weight of the newest observation
+_engine_min_success_rate = 0.5  # Engines below this are tried after the healthy ones
+
+
+def _emit(event: str, **fields):
+    """
+    Record a structured metric event; details are logged only when DEBUG logging is enabled
+    """
+    with _metrics_lock:
+        _metrics[event] += 1
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %s", event, fields)
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Snapshot of the event counters, per-engine search statistics and the adaptive Gemini rate
+    """
+    with _metrics_lock:
+        return {
+            'events': dict(_metrics),
+            'engines': {name: dict(stats) for name, stats in _engine_stats.items()},
+            'gemini_rate_factor': _gemini_rate_limiter.factor,
+        }
+
+
+def _record_engine_result(engine_name: str, latency: float, success: bool):
+    """Fold one search engine outcome into its moving averages"""
+    with _metrics_lock:
+        stats = _engine_stats.get(engine_name)
+        if stats is None:
+            _engine_stats[engine_name] = {'latency': latency, 'success_rate': float(success)}
+        else:
+            stats['latency'] += _engine_stats_alpha * (latency - stats['latency'])
+            stats['success_rate'] += _engine_stats_alpha * (float(success) - stats['success_rate'])
+    _emit('search_engine_success' if success else 'search_engine_failure',
+          engine=engine_name, latency=round(latency, 3))
+
+
+def _engine_order_key(engine):
+    """
+    Sort key for (name, func) search engines: engines that have recently been failing go last.
+    Otherwise the configured order, best results first, is kept; latency is deliberately
+    ignored, since the fastest engine (cached RSS feeds) is also the least precise
+    """
+    stats = _engine_stats.get(engine[0])
+    return stats is not None and stats['success_rate'] < _engine_min_success_rate
+
+# Images larger than this are rejected before they are downloaded
+_max_image_bytes = 10 * 1024 * 1024  # 10 MB
+
+# Image descriptions keyed by model, prompt and image URL, so an image shared by several
+# posts is downloaded and described once. With NOTE_WRITER_HTTP_CACHE=1 they also persist
+# across runs, since posts that failed are picked up again by the next run
+_image_description_cache = _TTLCache(_cache_max_entries, 3600,  # 1 hour
+                                     backing=_persistent_cache("image_descriptions", 86400))
+
+
+def _cached_image_description(key: str) -> Optional[str]:
+    description = _image_description_cache.get(key)
+    if description is None:
+        _emit('image_cache_miss')
+    else:
+        _emit('image_cache_hit')
+        print("📋 Using cached image description")
+    return description
+
+
+def _store_image_description(key: str, description: str):
+    _image_description_cache.set(key, description)
+
+
+# One lock per image being described, so when posts described in parallel share an image
+# the later callers wait for the first description instead of requesting their own.
+# Entries are [lock, number of callers using it] and are dropped when the last caller is done,
+# so the map only ever holds the images being described right now
+_image_description_locks: Dict[str, List[Any]] = {}
+_image_description_locks_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _image_description_lock(key: str):
+    with _image_description_locks_lock:
+        entry = _image_description_locks.get(key)
+        if entry is None:
+            entry = _image_description_locks[key] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _image_description_locks_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _image_description_locks[key]
+
+def _reserve_request_slot() -> float:
+    """
+    Reserve the next Gemini request slot and return how many seconds to wait before using it
+    """
+    return _gemini_rate_limiter.reserve()
 
 def _rate_limit():
     """Ensure we don't exceed the Gemini API rate limit"""
-    global _last_request_time
-    current_time = time.time()
-    time_since_last = current_time - _last_request_time
-    
-    if time_since_last < _min_request_interval:
-        wait_time = _min_request_interval - time_since_last
-        print(f"Rate limiting: waiting {wait_time:.1f} seconds...")
+    wait_time = _reserve_request_slot()
+    if wait_time > 0:
+        _emit('rate_limit_wait', wait_s=round(wait_time, 2))
         time.sleep(wait_time)
+
+class _ErrorKind(IntEnum):
+    """How a failed Gemini call should be treated"""
+    RATE_LIMIT = 0
+    UNAVAILABLE = 1
+    NONE_TEXT = 2
+    TRANSIENT = 3
+    CONTENT_FILTERED = 4
+    FATAL = 5
+
+
+# Exponential backoff (base, cap) in seconds for each retryable error kind
+_BACKOFF_PARAMS = {
+    _ErrorKind.UNAVAILABLE: (10, 120),  # Service unavailable: shorter initial wait
+    _ErrorKind.NONE_TEXT: (15, 90),  # None response text: moderate wait
+    _ErrorKind.RATE_LIMIT: (30, 300),  # Rate limits: longer waits, max 5 minutes
+    _ErrorKind.TRANSIENT: (15, 90),  # Other temporary API issues
+}
+_retry_jitter_fraction = 0.25  # Up to 25% extra on server-provided waits so workers don't retry in lockstep
+
+_RETRY_MESSAGES = {
+    _ErrorKind.UNAVAILABLE: "Service unavailable (503).",
+    _ErrorKind.NONE_TEXT: "Gemini returned None response (likely content filtering or temporary issue).",
+    _ErrorKind.RATE_LIMIT: "Rate limit hit.",
+}
+
+_RETRIES_EXHAUSTED_MESSAGES = {
+    _ErrorKind.UNAVAILABLE: ("Service unavailable after {max_retries} retries. "
+                             "The Gemini API is currently overloaded. Please try again later."),
+    _ErrorKind.NONE_TEXT: ("Gemini API returned None response after {max_retries} retries. "
+                           "This may be due to content filtering or temporary model issues. "
+                           "Please check your input content and try again later."),
+    _ErrorKind.RATE_LIMIT: ("Rate limit exceeded after {max_retries} retries. "
+                            "Gemini API free tier allows 15 requests per minute. "
+                            "Consider upgrading your plan or waiting before retrying."),
+    _ErrorKind.TRANSIENT: "Temporary API issue persisted after {max_retries} retries: {error}",
+}
+
+# Every marker the retry logic cares about, tagged by the kind of error it indicates:
+# rate limits, overloaded or flaky service, None responses and network issues are retryable,
+# while content filtering blocks are permanent
+_ERROR_MARKERS_RE = re.compile(
+    r'(?P<CONTENT_FILTERED>CONTENT_FILTERED:)'
+    r'|(?P<UNAVAILABLE>503|UNAVAILABLE)'
+    r'|(?P<NONE_TEXT>returned None response text)'
+    r'|(?P<RATE_LIMIT>429|RESOURCE_EXHAUSTED)'
+    r'|(?P<TRANSIENT>INTERNAL|UNKNOWN|(?i:timeout|connection))'
+)
+# When several markers appear, the first kind in this order wins
+_ERROR_KIND_PRIORITY = (
+    _ErrorKind.CONTENT_FILTERED,
+    _ErrorKind.UNAVAILABLE,
+    _ErrorKind.NONE_TEXT,
+    _ErrorKind.RATE_LIMIT,
+    _ErrorKind.TRANSIENT,
+)
+
+
+# Typed SDK errors are classified from their HTTP code or RPC status, without scanning the message
+_API_ERROR_CODE_KINDS = {
+    429: _ErrorKind.RATE_LIMIT,
+    503: _ErrorKind.UNAVAILABLE,
+}
+_API_ERROR_STATUS_KINDS = {
+    'RESOURCE_EXHAUSTED': _ErrorKind.RATE_LIMIT,
+    'UNAVAILABLE': _ErrorKind.UNAVAILABLE,
+    'INTERNAL': _ErrorKind.TRANSIENT,
+    'UNKNOWN': _ErrorKind.TRANSIENT,
+}
+
+
+class _EmptyResponseError(Exception):
+    """Gemini returned no text; content_filtered means a safety block that retrying won't fix"""
+
+    def __init__(self, message: str, content_filtered: bool):
+        super().__init__(message)
+        self.content_filtered = content_filtered
+
+
+def _classify_error(e: Exception, error_str: str) -> _ErrorKind:
+    """
+    Classify a failed API call. Errors we raise ourselves and typed SDK errors are classified
+    from their attributes; anything else falls back to a single scan of the message
+    """
+    if isinstance(e, _EmptyResponseError):
+        return _ErrorKind.CONTENT_FILTERED if e.content_filtered else _ErrorKind.NONE_TEXT
+    if isinstance(e, genai_errors.APIError):
+        kind = _API_ERROR_CODE_KINDS.get(e.code) or _API_ERROR_STATUS_KINDS.get(e.status)
+        if kind is not None:
+            return kind
+    
+    found = {match.lastgroup for match in _ERROR_MARKERS_RE.finditer(error_str)}
+    for kind in _ERROR_KIND_PRIORITY:
+        if kind.name in found:
+            return kind
+    return _ErrorKind.FATAL
+
+
+# e.g. "retryDelay": "55s" in the RESOURCE_EXHAUSTED error details
+_RETRY_DELAY_RE = re.compile(r'retryDelay[\'"]?\s*[:=]\s*[\'"]?(\d+(?:\.\d+)?)(ms|s)?')
+_max_retry_wait_seconds = 300  # Never trust a hint beyond 5 minutes
+
+
+def _parse_retry_after(e: Exception, error_str: str) -> Optional[float]:
+    """
+    Seconds the server asked us to wait, from the retryDelay in the error details
+    or a Retry-After header on the HTTP response; None if there is no hint
+    """
+    match = _RETRY_DELAY_RE.search(error_str)
+    if match:
+        delay = float(match.group(1))
+        return delay / 1000 if match.group(2) == 'ms' else delay
+    
+    response = getattr(e, 'response', None)
+    headers = getattr(response, 'headers', None)
+    retry_after = headers.get('Retry-After') if headers is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            # Retry-After may also be an HTTP date
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    """
+    Equal-jitter exponential backoff: at least half the exponential ceiling, plus a random
+    share of the other half, so a retry never follows the failure almost immediately while
+    workers that failed together still don't all retry at the same moment
+    """
+    ceiling = min(cap, base * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _get_retry_wait_time(e: Exception, attempt: int, max_retries: int) -> float:
+    """
+    Decide how long to wait before retrying a failed API call.
+    Raises a descriptive exception if the error is not retryable or retries are exhausted
+    """
+    error_str = str(e)
+    error_kind = _classify_error(e, error_str)
+    if error_kind == _ErrorKind.RATE_LIMIT:
+        # Slow every worker down, not just this call
+        _gemini_rate_limiter.record_rate_limited()
+    
+    if error_kind == _ErrorKind.CONTENT_FILTERED:
+        raise Exception(f"Gemini API blocked your content due to safety filters. "
+                      f"The prompt contains content that violates Gemini's usage policies. "
+                      f"Please review and modify your input to avoid prohibited content. "
+                      f"Details: {error_str}")
+    if error_kind == _ErrorKind.FATAL:
+        raise Exception(f"Error making Gemini request: {error_str}")
+    if attempt >= max_retries:
+        # Final retry attempt failed
+        raise Exception(_RETRIES_EXHAUSTED_MESSAGES[error_kind].format(max_retries=max_retries, error=error_str))
+    
+    # Prefer the wait the server asked for; the schedule is only a fallback
+    retry_hint = _parse_retry_after(e, error_str)
+    if retry_hint is not None:
+        base_wait = min(retry_hint, _max_retry_wait_seconds)
+        wait_time = base_wait + random.uniform(0, _retry_jitter_fraction * base_wait)
+    else:
+        wait_time = _backoff(attempt, *_BACKOFF_PARAMS[error_kind])
     
-    _last_request_time = time.time()
+    description = _RETRY_MESSAGES.get(error_kind) or f"Temporary API issue: {error_str[:100]}..."
+    print(f"{description} Waiting {wait_time:.0f} seconds before retry {attempt + 1}/{max_retries}...")
+    return wait_time
 
 def _retry_with_backoff(api_call_func, max_retries: int = 3):
     """
     Execute an API call with retry logic for rate limiting and service errors
     """
-    _rate_limit()  # Apply rate limiting before each request
-    
-    is_content_filtered = False  # Track if error is due to content filtering
-    
     for attempt in range(max_retries + 1):
+        # Every attempt takes a token, so retries after a 429 or 503 are paced like any other request
+        _rate_limit()
         try:
-            return api_call_func()
+            with _gemini_inflight:
+                result = api_call_func()
+            _gemini_rate_limiter.record_success()
+            return result
         except Exception as e:
-            error_str = str(e)
-            
-            # Handle retryable errors:
-            # - Rate limiting (429 errors)
-            # - Service unavailable (503 errors) 
-            # - None response text (only if NOT content filtered)
-            # - Other temporary API issues
-            # Note: Content filtering blocks are permanent and should not be retried
-            is_content_filtered = "CONTENT_FILTERED:" in error_str
-            is_retryable = not is_content_filtered and any([
-                "429" in error_str,
-                "RESOURCE_EXHAUSTED" in error_str,
-                "503" in error_str,
-                "UNAVAILABLE" in error_str,
-                "returned None response text" in error_str,
-                "INTERNAL" in error_str,
-                "UNKNOWN" in error_str,
-                "timeout" in error_str.lower(),
-                "connection" in error_str.lower()
-            ])
-            
-            if is_retryable and attempt < max_retries:
-                # Determine wait time based on error type
-                if "503" in error_str or "UNAVAILABLE" in error_str:
-                    # For service unavailable, use shorter initial wait time
-                    wait_time = 10 if attempt == 0 else min(30 * (2 ** (attempt - 1)), 120)
-                    print(f"Service unavailable (503). Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                elif "returned None response text" in error_str:
-                    # For None response text, use moderate wait time
-                    wait_time = 15 + (attempt * 10)  # 15s, 25s, 35s
-                    print(f"Gemini returned None response (likely content filtering or temporary issue). Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                elif "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    # For rate limiting, use longer wait times
-                    wait_time = 60  # Default to 60 seconds for rate limits
-                    if "retryDelay" in error_str and "55s" in error_str:
-                        wait_time = 55
-                    elif attempt > 0:
-                        wait_time = min(60 * (2 ** attempt), 300)  # Exponential backoff, max 5 minutes
-                    print(f"Rate limit hit. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                else:
-                    # For other retryable errors, use moderate wait time
-                    wait_time = 20 + (attempt * 15)  # 20s, 35s, 50s
-                    print(f"Temporary API issue: {error_str[:100]}... Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                
-                time.sleep(wait_time)
-                continue
-            elif is_retryable and attempt >= max_retries:
-                # Final retry attempt failed
-                if "503" in error_str or "UNAVAILABLE" in error_str:
-                    raise Exception(f"Service unavailable after {max_retries} retries. "
-                                  f"The Gemini API is currently overloaded. Please try again later.")
-                elif "returned None response text" in error_str:
-                    raise Exception(f"Gemini API returned None response after {max_retries} retries. "
-                                  f"This may be due to content filtering or temporary model issues. "
-                                  f"Please check your input content and try again later.")
-                elif "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    raise Exception(f"Rate limit exceeded after {max_retries} retries. "
-                                  f"Gemini API free tier allows 15 requests per minute. "
-                                  f"Consider upgrading your plan or waiting before retrying.")
-                else:
-                    raise Exception(f"Temporary API issue persisted after {max_retries} retries: {error_str}")
-            else:
-                # Non-retryable error, fail immediately
-                if is_content_filtered:
-                    raise Exception(f"Gemini API blocked your content due to safety filters. "
-                                  f"The prompt contains content that violates Gemini's usage policies. "
-                                  f"Please review and modify your input to avoid prohibited content. "
-                                  f"Details: {str(e)}")
-                else:
-                    raise Exception(f"Error making Gemini request: {str(e)}")
+            time.sleep(_get_retry_wait_time(e, attempt, max_retries))
     
     # Should never reach here
     raise Exception("Unexpected error in _retry_with_backoff")
 
-def _make_request(prompt, temperature: float = 0.8, max_retries: int = 3):
+def _extract_text_or_raise(response, context: str = "") -> str:
+    """
+    Return the response text, or raise a detailed error explaining why Gemini returned None.
+    Content filtering blocks are marked with CONTENT_FILTERED: so they are not retried
+    """
+    text = response.text
+    if text is not None:
+        return text
+    
+    # Try to get more information about why the response is None
+    error_details = []
+    is_content_filtered = False
+    
+    # Check for prompt feedback first (this is where content filtering blocks are reported)
+    prompt_feedback = getattr(response, 'prompt_feedback', None)
+    if prompt_feedback is not None:
+        block_reason = getattr(prompt_feedback, 'block_reason', None)
+        if block_reason is not None:
+            block_reason = str(block_reason)
+            error_details.append(f"block_reason: {block_reason}")
+            # Check if this is a content filtering block (permanent, non-retryable)
+            if 'PROHIBITED_CONTENT' in block_reason or 'SAFETY' in block_reason:
+                is_content_filtered = True
+        prompt_safety_ratings = getattr(prompt_feedback, 'safety_ratings', None)
+        if prompt_safety_ratings is not None:
+            error_details.append(f"prompt_safety_ratings: {prompt_safety_ratings}")
+    
+    # Check if there are any candidates
+    candidates = getattr(response, 'candidates', None)
+    if candidates:
+        candidate = candidates[0]
+        finish_reason = getattr(candidate, 'finish_reason', None)
+        if finish_reason is not None:
+            finish_reason = str(finish_reason)
+            error_details.append(f"finish_reason: {finish_reason}")
+            # Also check finish reason for safety blocks
+            if 'SAFETY' in finish_reason or 'PROHIBITED' in finish_reason:
+                is_content_filtered = True
+        safety_ratings = getattr(candidate, 'safety_ratings', None)
+        if safety_ratings is not None:
+            error_details.append(f"safety_ratings: {safety_ratings}")
+    
+    error_msg = "Gemini API returned None response text"
+    if context:
+        error_msg += f" for {context}"
+    if error_details:
+        error_msg += f" ({'; '.join(error_details)})"
+    
+    # If this is a content filtering issue, mark it as non-retryable
+    if is_content_filtered:
+        error_msg = f"CONTENT_FILTERED: {error_msg}"
+    
+    print(f"DEBUG: {error_msg}")
+    print(f"DEBUG: Full response object: {response}")
+    
+    raise _EmptyResponseError(error_msg, is_content_filtered)
+
+def _request_key(*parts) -> str:
+    """
+    Deterministic idempotency key for a Gemini request built from everything that shapes its output
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode('utf-8', errors='replace'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _cached_response(request_key: str) -> Optional[str]:
+    cached_response = _response_cache.get(request_key)
+    if cached_response is None:
+        _emit('response_cache_miss')
+    else:
+        _emit('response_cache_hit')
+        print("📋 Using cached Gemini response")
+    return cached_response
+
+
+def _store_response(request_key: str, temperature: float, response_text: str):
+    _response_cache.set(request_key, response_text,
+                        persist=temperature <= _persistent_response_max_temperature)
+
+
+class ResultCache:
+    """
+    Cache for results other modules derive from Gemini answers, such as the misleading tags.
+    Bounded like the caches above, counted in the run metrics as <name>_cache_hit/_miss, and
+    with NOTE_WRITER_HTTP_CACHE=1 also kept on disk for persist_ttl_seconds
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, persist_ttl_seconds: Optional[float] = None):
+        self._name = name
+        self._cache = _TTLCache(_cache_max_entries, ttl_seconds,
+                                backing=_persistent_cache(name, persist_ttl_seconds or ttl_seconds))
+
+    def key(self, *parts) -> str:
+        """Deterministic key for everything that shapes the cached result"""
+        return _request_key(self._name, *parts)
+
+    def get(self, key: str):
+        """Return the cached value for key, or None if missing or expired"""
+        value = self._cache.get(key)
+        _emit(f'{self._name}_cache_miss' if value is None else f'{self._name}_cache_hit')
+        return value
+
+    def set(self, key: str, value):
+        self._cache.set(key, value)
+
+
+def _make_request(prompt, temperature: float = 0.8, max_retries: int = 3, response_schema: Optional[dict] = None,
+                  bypass_cache: bool = False):
     """
-    Make a request to Gemini API with retry logic for rate limiting
+    Make a request to Gemini API with retry logic for rate limiting.
+    With response_schema, Gemini is constrained to answer with JSON matching that schema.
+    bypass_cache asks Gemini again instead of reusing a cached answer, for callers retrying
+    because they couldn't use that answer; the new answer replaces the cached one
     """
+    if response_schema is None:
+        request_key = _request_key(_gemini_model, temperature, prompt)
+        schema_config = {}
+    else:
+        request_key = _request_key(_gemini_model, temperature, prompt, json.dumps(response_schema, sort_keys=True))
+        schema_config = {"response_mime_type": "application/json", "response_schema": response_schema}
+    if not bypass_cache:
+        cached_response = _cached_response(request_key)
+        if cached_response is not None:
+            return cached_response
+    
     def api_call():
         response = client.models.generate_content(
-            model='gemini-2.5-flash',
+            model=_gemini_model,
             contents=prompt,
             config=types.GenerateContentConfig(
                 temperature=temperature,
                 max_output_tokens=8192,
+                **schema_config,
             )
         )
-        
-        # Check if response text is None and provide detailed error info
-        if response.text is None:
-            # Try to get more information about why the response is None
-            error_details = []
-            is_content_filtered = False
-            
-            # Check for prompt feedback first (this is where content filtering blocks are reported)
-            if hasattr(response, 'prompt_feedback'):
-                if hasattr(response.prompt_feedback, 'block_reason'):
-                    block_reason = str(response.prompt_feedback.block_reason)
-                    error_details.append(f"block_reason: {block_reason}")
-                    # Check if this is a content filtering block (permanent, non-retryable)
-                    if 'PROHIBITED_CONTENT' in block_reason or 'SAFETY' in block_reason:
-                        is_content_filtered = True
-                if hasattr(response.prompt_feedback, 'safety_ratings'):
-                    error_details.append(f"prompt_safety_ratings: {response.prompt_feedback.safety_ratings}")
-            
-            # Check if there are any candidates
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'finish_reason'):
-                    finish_reason = str(candidate.finish_reason)
-                    error_details.append(f"finish_reason: {finish_reason}")
-                    # Also check finish reason for safety blocks
-                    if 'SAFETY' in finish_reason or 'PROHIBITED' in finish_reason:
-                        is_content_filtered = True
-                if hasattr(candidate, 'safety_ratings'):
-                    error_details.append(f"safety_ratings: {candidate.safety_ratings}")
-            
-            error_msg = "Gemini API returned None response text"
-            if error_details:
-                error_msg += f" ({'; '.join(error_details)})"
-            
-            # If this is a content filtering issue, mark it as non-retryable
-            if is_content_filtered:
-                error_msg = f"CONTENT_FILTERED: {error_msg}"
-            
-            print(f"DEBUG: {error_msg}")
-            print(f"DEBUG: Full response object: {response}")
-            
-            raise Exception(error_msg)
-        
-        return response.text
+        return _extract_text_or_raise(response)
     
-    return _retry_with_backoff(api_call, max_retries)
+    response_text = _retry_with_backoff(api_call, max_retries)
+    _store_response(request_key, temperature, response_text)
+    return response_text
 
 
-def get_gemini_response(prompt: str, temperature: float = 0.8):
+def get_gemini_response(prompt: str, temperature: float = 0.8, response_schema: Optional[dict] = None,
+                        bypass_cache: bool = False):
     """
-    Get a response from Gemini for text-based prompts
+    Get a response from Gemini for text-based prompts.
+    Pass response_schema (an OpenAPI-style dict) to get JSON that matches it, and
+    bypass_cache=True when retrying because the previous answer was unusable
     """
-    return _make_request(prompt, temperature)
+    return _make_request(prompt, temperature, response_schema=response_schema, bypass_cache=bypass_cache)
 
 
-def gemini_describe_image(image_url: str, temperature: float = 0.01, max_retries: int = 3):
+# A stop marker only counts if it shows up this early, i.e. the answer opens with it
+_stream_stop_window_chars = 64
+
+
+def get_gemini_response_streamed(prompt: str, stop_markers: Tuple[str, ...], temperature: float = 0.8,
+                                 max_retries: int = 3, bypass_cache: bool = False):
     """
-    Describe an image using Gemini's vision capabilities
+    Like get_gemini_response, but streams the answer and stops reading as soon as its opening
+    contains one of stop_markers (e.g. a refusal), so that case doesn't wait for the rest of
+    the generation. The text returned then is only the opening of the answer.
+    bypass_cache works as in _make_request
     """
-    try:
-        import requests
-        from PIL import Image
-        import io
-        
-        # Download the image
-        response = requests.get(image_url)
+    request_key = _request_key(_gemini_model, temperature, prompt)
+    if not bypass_cache:
+        cached_response = _cached_response(request_key)
+        if cached_response is not None:
+            return cached_response
+    
+    def api_call():
+        stream = client.models.generate_content_stream(
+            model=_gemini_model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                max_output_tokens=8192,
+            )
+        )
+        text = ""
+        last_chunk = None
+        try:
+            for chunk in stream:
+                last_chunk = chunk
+                text += chunk.text or ""
+                if any(text.find(marker, 0, _stream_stop_window_chars + len(marker)) != -1
+                       for marker in stop_markers):
+                    _emit('stream_stopped_early')
+                    return text, True
+        finally:
+            # Closing the generator drops the connection, which ends the generation
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+        if not text:
+            if last_chunk is None:
+                raise _EmptyResponseError("Empty streamed response from Gemini", False)
+            _extract_text_or_raise(last_chunk)
+        return text, False
+    
+    response_text, stopped_early = _retry_with_backoff(api_call, max_retries)
+    # Only complete answers are cached; a cut-off one isn't what get_gemini_response would return
+    if not stopped_early:
+        _store_response(request_key, temperature, response_text)
+    return response_text
+
+
+_describe_image_prompt = "What's in this image? Provide a detailed description."
+
+def _download_image_part(image_url: str):
+    """
+    Download an image and wrap its encoded bytes in a Part Gemini can consume directly
+    """
+    # Download the image, refusing anything that announces itself as too large
+    with _http_session.get(image_url, timeout=(_connect_timeout_seconds, 15), stream=True) as response:
         if response.status_code != 200:
             raise Exception(f"Failed to download image: {response.status_code}")
         
-        # Convert to PIL Image
-        image = Image.open(io.BytesIO(response.content))
+        content_length = int(response.headers.get('Content-Length') or 0)
+        if content_length > _max_image_bytes:
+            raise Exception(f"Image too large to describe: {content_length} bytes")
         
-        prompt = "What's in this image? Provide a detailed description."
+        # Content-Length is optional, so also stop reading as soon as the cap is passed
+        image_bytes, _ = _read_bytes_limited(response, _max_image_bytes + 1)
+        if len(image_bytes) > _max_image_bytes:
+            raise Exception(f"Image too large to describe: more than {_max_image_bytes} bytes")
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+    
+    # Send the encoded bytes as-is; decoding and re-encoding with PIL only costs time and memory
+    mime_type = content_type if content_type.startswith('image/') else 'image/jpeg'
+    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+
+
+def gemini_describe_image(image_url: str, temperature: float = 0.01, max_retries: int = 3):
+    """
+    Describe an image using Gemini's vision capabilities
+    """
+    cache_key = _request_key(_gemini_model, temperature, _describe_image_prompt, image_url)
+    cached_description = _cached_image_description(cache_key)
+    if cached_description is not None:
+        return cached_description
+    
+    with _image_description_lock(cache_key):
+        # Another thread may have described this image while we waited for the lock
+        cached_description = _image_description_cache.get(cache_key)
+        if cached_description is not None:
+            return cached_description
         
-        # Define the API call function
-        def api_call():
-            response = client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=[prompt, image],
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    max_output_tokens=2048,
-                )
-            )
+        try:
+            image = _download_image_part(image_url)
+            prompt = _describe_image_prompt
             
-            # Check if response text is None and provide detailed error info
-            if response.text is None:
-                # Try to get more information about why the response is None
-                error_details = []
-                is_content_filtered = False
-                
-                # Check for prompt feedback first (this is where content filtering blocks are reported)
-                if hasattr(response, 'prompt_feedback'):
-                    if hasattr(response.prompt_feedback, 'block_reason'):
-                        block_reason = str(response.prompt_feedback.block_reason)
-                        error_details.append(f"block_reason: {block_reason}")
-                        # Check if this is a content filtering block (permanent, non-retryable)
-                        if 'PROHIBITED_CONTENT' in block_reason or 'SAFETY' in block_reason:
-                            is_content_filtered = True
-                    if hasattr(response.prompt_feedback, 'safety_ratings'):
-                        error_details.append(f"prompt_safety_ratings: {response.prompt_feedback.safety_ratings}")
-                
-                # Check if there are any candidates
-                if hasattr(response, 'candidates') and response.candidates:
-                    candidate = response.candidates[0]
-                    if hasattr(candidate, 'finish_reason'):
-                        finish_reason = str(candidate.finish_reason)
-                        error_details.append(f"finish_reason: {finish_reason}")
-                        # Also check finish reason for safety blocks
-                        if 'SAFETY' in finish_reason or 'PROHIBITED' in finish_reason:
-                            is_content_filtered = True
-                    if hasattr(candidate, 'safety_ratings'):
-                        error_details.append(f"safety_ratings: {candidate.safety_ratings}")
-                
-                error_msg = "Gemini API returned None response text for image description"
-                if error_details:
-                    error_msg += f" ({'; '.join(error_details)})"
-                
-                # If this is a content filtering issue, mark it as non-retryable
-                if is_content_filtered:
-                    error_msg = f"CONTENT_FILTERED: {error_msg}"
-                
-                print(f"DEBUG: {error_msg}")
-                print(f"DEBUG: Full response object: {response}")
+            # Define the API call function
+            def api_call():
+                response = client.models.generate_content(
+                    model=_gemini_model,
+                    contents=[prompt, image],
+                    config=types.GenerateContentConfig(
+                        temperature=temperature,
+                        max_output_tokens=2048,
+                    )
+                )
                 
-                raise Exception(error_msg)
+                return _extract_text_or_raise(response, "image description")
             
-            return response.text
-        
-        # Use shared retry logic
-        return _retry_with_backoff(api_call, max_retries)
-        
-    except Exception as e:
-        raise Exception(f"Error describing image with Gemini: {str(e)}")
+            # Use shared retry logic
+            description = _retry_with_backoff(api_call, max_retries)
+            _store_image_description(cache_key, description)
+            return description
+            
+        except Exception as e:
+            raise Exception(f"Error describing image with Gemini: {str(e)}")
 
 
 def search_web_for_recent_info(query: str, max_results: int = 10) -> str:
@@ -276,20 +838,14 @@ def search_web_for_recent_info(query: str, max_results: int = 10) -> str:
     """
     # Check cache first to avoid duplicate API calls
     cache_key = f"{query.strip()[:100]}_{max_results}"  # Limit key length
-    current_time = time.time()
-    
-    # Clean expired cache entries
-    expired_keys = [k for k, (timestamp, _) in _search_cache.items() 
-                   if current_time - timestamp > _cache_expiry_seconds]
-    for k in expired_keys:
-        del _search_cache[k]
     
     # Return cached result if available and not expired
-    if cache_key in _search_cache:
-        timestamp, cached_result = _search_cache[cache_key]
-        if current_time - timestamp <= _cache_expiry_seconds:
-            print(f"📋 Using cached search results for: {query[:50]}...")
-            return cached_result
+    cached_result = _search_cache.get(cache_key)
+    if cached_result is not None:
+        _emit('search_cache_hit')
+        print(f"📋 Using cached search results for: {query[:50]}...")
+        return cached_result
+    _emit('search_cache_miss')
     
     print(f"🔍 Starting multi-engine search for: {query[:50]}...")
     
@@ -300,47 +856,205 @@ def search_web_for_recent_info(query: str, max_results: int = 10) -> str:
         ("News Scraper", _search_with_news_scraper)
     ]
     
-    for engine_name, search_func in search_engines:
+    # Engines that have recently been failing are tried after the healthy ones
+    search_engines.sort(key=_engine_order_key)
+    
+    # Engines run in daemon threads: one still busy (e.g. in Google's 429 cool-off) when we
+    # stop waiting for it is simply abandoned and never keeps the process alive at exit
+    outcomes = queue.Queue()
+    
+    def timed_search(engine_idx, engine_name, search_func):
+        # Record every engine's outcome, including the ones that finish after we stopped waiting.
+        # The stats are updated before the outcome is handed over, so a search never returns
+        # while one of its own engines is still about to change the ordering for the next one
+        start_time = time.monotonic()
         try:
-            print(f"🔍 Trying {engine_name}...")
             results = search_func(query, max_results)
-            
-            # Check if the result is a failure message from any search engine
-            failure_patterns = [
-                "Web search error",  # General error
-                "Google search rate limited or no results found",  # Google
-                "No valid results found from Google search",  # Google
-                "No relevant news found in RSS feeds",  # RSS
-                "No articles found through web scraping",  # News Scraper
-            ]
-            
-            is_failure = not results or any(pattern in results for pattern in failure_patterns)
-            
-            if not is_failure:
-                # Extract result count from the results string
-                result_count = 0
-                if "Result 1" in results:
-                    # Count the number of "Result X:" or "Result X (Priority:" patterns
-                    result_count = len(re.findall(r'Result \d+(?:\s*\(Priority:\s*\d+\))?:', results))
-                
-                print(f"✅ {engine_name} successful - found {result_count} results")
-                # Cache the successful result
-                _search_cache[cache_key] = (current_time, results)
-                return results
-            else:
-                print(f"⚠️ {engine_name} returned no results")
-                
         except Exception as e:
-            print(f"❌ {engine_name} failed: {str(e)}")
+            _record_engine_result(engine_name, time.monotonic() - start_time, False)
+            outcomes.put((engine_idx, None, e))
+            return
+        success = bool(results) and _SEARCH_FAILURE_RE.search(results) is None
+        _record_engine_result(engine_name, time.monotonic() - start_time, success)
+        outcomes.put((engine_idx, results, None))
+    
+    next_engine_idx = 0
+    running = 0
+    hedge_at = 0.0
+    
+    def start_next_engine():
+        nonlocal next_engine_idx, running, hedge_at
+        engine_name, search_func = search_engines[next_engine_idx]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 Trying %s...", engine_name)
+        threading.Thread(target=timed_search, args=(next_engine_idx, engine_name, search_func),
+                         name=f"search-{engine_name}", daemon=True).start()
+        next_engine_idx += 1
+        running += 1
+        hedge_at = time.monotonic() + _engine_time_budget_seconds
+    
+    # Engines are tried in order of result quality. Each one gets a time budget of its own;
+    # a failure moves on to the next engine right away, and an engine still running when its
+    # budget is spent is hedged by starting the next one alongside it
+    search_deadline = time.monotonic() + _search_deadline_seconds
+    start_next_engine()
+    while running:
+        can_hedge = next_engine_idx < len(search_engines)
+        timeout = (min(hedge_at, search_deadline) if can_hedge else search_deadline) - time.monotonic()
+        try:
+            engine_idx, results, error = outcomes.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            if not can_hedge or time.monotonic() >= search_deadline:
+                print(f"⏱️ Search engines still running after {_search_deadline_seconds}s, giving up on them")
+                break
+            print(f"⏱️ {search_engines[next_engine_idx - 1][0]} is slow, also trying {search_engines[next_engine_idx][0]}")
+            start_next_engine()
             continue
+        
+        running -= 1
+        engine_name = search_engines[engine_idx][0]
+        if error is not None:
+            print(f"❌ {engine_name} failed: {str(error)}")
+        elif not results or _SEARCH_FAILURE_RE.search(results) is not None:
+            # The result is a failure message from the search engine
+            print(f"⚠️ {engine_name} returned no results")
+        else:
+            # Extract result count from the results string
+            result_count = 0
+            if "Result 1" in results:
+                # Count the number of "Result X:" or "Result X (Priority:" patterns
+                result_count = len(_RESULT_HEADER_RE.findall(results))
+            
+            print(f"✅ {engine_name} successful - found {result_count} results")
+            # Cache the successful result
+            _search_cache.set(cache_key, results)
+            return results
+        
+        # Nothing usable yet; with no engine left running, the next one starts right away
+        if running == 0 and next_engine_idx < len(search_engines):
+            start_next_engine()
     
     # If all engines fail, return a helpful error message
     error_msg = f"❌ All search engines failed for query: {query}. Please try again later or check your internet connection."
-    _search_cache[cache_key] = (current_time, error_msg)
+    # Failures are only remembered for this run; the next run should search again
+    _search_cache.set(cache_key, error_msg, persist=False)
     return error_msg
 
 
 
+def _read_bytes_limited(response, max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    Read at most max_bytes from a streamed response.
+    Returns (raw bytes, truncated) where truncated means reading stopped at the byte limit
+    """
+    chunks = []
+    size = 0
+    truncated = False
+    for chunk in response.iter_content(chunk_size=16384):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            truncated = True
+            break
+    return b''.join(chunks)[:max_bytes], truncated
+
+
+def _read_text_limited(response, max_bytes: int) -> Tuple[str, bool]:
+    """
+    Read at most max_bytes from a streamed response and decode them.
+    Returns (text, truncated) where truncated means reading stopped at the byte limit
+    """
+    raw, truncated = _read_bytes_limited(response, max_bytes)
+    
+    # Handle encoding properly
+    try:
+        return raw.decode(response.encoding or 'utf-8', errors='replace'), truncated
+    except LookupError:
+        # Unknown encoding in the response headers
+        return raw.decode('utf-8', errors='replace'), truncated
+
+
+_metadata_fetch_bytes = 16384  # <title> and <meta> tags are almost always within the first 16 KB
+_metadata_fetch_workers = 8
+_DESCRIPTION_META_KEYS = (('name', 'description'), ('property', 'og:description'), ('name', 'twitter:description'))
+
+
+def _extract_page_metadata(soup) -> Tuple[str, str]:
+    """
+    Title and description of a parsed page, collected in a single pass over its
+    <title>, <meta> and <p> tags instead of one tree search per lookup
+    """
+    title_tag = None
+    first_meta_by_key = {}
+    paragraphs = []
+    for tag in soup.find_all(['title', 'meta', 'p']):
+        if tag.name == 'title':
+            if title_tag is None:
+                title_tag = tag
+        elif tag.name == 'meta':
+            for attr_name, attr_value in _DESCRIPTION_META_KEYS:
+                if tag.get(attr_name) == attr_value:
+                    first_meta_by_key.setdefault((attr_name, attr_value), tag)
+        elif len(paragraphs) < 3:
+            paragraphs.append(tag)
+    
+    title = "No title"
+    if title_tag is not None and title_tag.string:
+        title = title_tag.string.strip()[:200]  # Limit title length
+    
+    description = "No description"
+    # Meta description selectors, in order of preference
+    meta_desc = next(
+        (first_meta_by_key[key] for key in _DESCRIPTION_META_KEYS if key in first_meta_by_key), None
+    )
+    if meta_desc is not None:
+        meta_content = meta_desc.get('content')
+        if isinstance(meta_content, str):
+            description = meta_content.strip()[:300]  # Limit description length
+    
+    # If no meta description, try to get text from the page
+    if description == "No description" and paragraphs:
+        description = ' '.join([p.get_text().strip() for p in paragraphs])[:300]
+    
+    return title, description
+
+
+def _fetch_page_metadata(url: str, query: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the title and description of a search result, downloading only the start of the page.
+    Returns None if the page did not respond successfully
+    """
+    try:
+        headers = {'Range': f'bytes=0-{_metadata_fetch_bytes - 1}'}
+        with _http_session.get(url, timeout=(_connect_timeout_seconds, 8), stream=True, headers=headers) as response:
+            # 206 means the server honoured the Range header, 200 means it sent the whole page
+            if response.status_code not in (200, 206):
+                return None
+            
+            # Stop reading once we have the <head> section
+            content, _ = _read_text_limited(response, _metadata_fetch_bytes)
+        
+        soup = BeautifulSoup(content, _HTML_PARSER, parse_only=_METADATA_STRAINER)
+        
+        title, description = _extract_page_metadata(soup)
+        
+        return {
+            'title': title,
+            'description': description,
+            'url': url,
+            'priority': _calculate_priority_score(title, description, url, query)
+        }
+        
+    except Exception as e:
+        # If we can't get details, still include the URL with basic info
+        return {
+            'title': url.split('/')[-1] if '/' in url else url,
+            'description': f"Description unavailable: {str(e)[:100]}",
+            'url': url,
+            'priority': 1
+        }
+
+
 def _search_with_yagooglesearch(query: str, max_results: int = 10) -> str:
     """
     Google search using yagooglesearch library with rate limit handling
@@ -385,93 +1099,39 @@ def _search_with_yagooglesearch(query: str, max_results: int = 10) -> str:
                 urls = client.search()
                 
                 if urls and "HTTP_429_DETECTED" not in urls:
-                    # Process the URLs to get titles and descriptions
-                    results = []
+                    # Collect unique candidate URLs, then fetch their titles and descriptions in parallel
+                    candidate_urls = []
                     seen_urls = set()
-                    
                     for url in urls[:max_results * 2]:  # Process more URLs
                         if url in seen_urls or _should_skip_url(url):
                             continue
-                        
                         seen_urls.add(url)
-                        
-                        # Try to get page title and description with better error handling
-                        try:
-                            response = requests.get(url, timeout=8, headers={
-                                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                            })
-                            
-                            if response.status_code == 200:
-                                from bs4 import BeautifulSoup
-                                
-                                # Handle encoding properly
-                                try:
-                                    # Try to get encoding from response headers
-                                    content = response.content
-                                    if response.encoding:
-                                        content = response.content.decode(response.encoding, errors='replace')
-                                    else:
-                                        content = response.content.decode('utf-8', errors='replace')
-                                    
-                                    soup = BeautifulSoup(content, 'html.parser')
-                                except UnicodeDecodeError:
-                                    # Fallback to replacing problematic characters
-                                    soup = BeautifulSoup(response.content, 'html.parser', from_encoding='utf-8')
-                                
-                                title = "No title"
-                                if soup.title and soup.title.string:
-                                    title = soup.title.string.strip()[:200]  # Limit title length
-                                
-                                description = "No description"
-                                # Try multiple meta description selectors
-                                meta_desc = soup.find('meta', attrs={'name': 'description'}) or \
-                                           soup.find('meta', attrs={'property': 'og:description'}) or \
-                                           soup.find('meta', attrs={'name': 'twitter:description'})
-                                
-                                if meta_desc and hasattr(meta_desc, 'get'):
-                                    content = meta_desc.get('content')  # type: ignore
-                                    if isinstance(content, str):
-                                        description = content.strip()[:300]  # Limit description length
-                                
-                                # If no meta description, try to get text from the page
-                                if description == "No description":
-                                    paragraphs = soup.find_all('p')
-                                    if paragraphs:
-                                        description = ' '.join([p.get_text().strip() for p in paragraphs[:3]])[:300]
-                                
-                                results.append({
-                                    'title': title,
-                                    'description': description,
-                                    'url': url,
-                                    'priority': _calculate_priority_score(title, description, url, query)
-                                })
-                                
-                        except Exception as e:
-                            # If we can't get details, still include the URL with basic info
-                            results.append({
-                                'title': url.split('/')[-1] if '/' in url else url,
-                                'description': f"Description unavailable: {str(e)[:100]}",
-                                'url': url,
-                                'priority': 1
-                            })
-                        
-                        if len(results) >= max_results:
-                            break
+                        candidate_urls.append(url)
+                    
+                    # Keep Google's ordering and drop pages that didn't respond; once enough pages
+                    # have answered, the remaining fetches would be discarded anyway, so stop waiting
+                    results = []
+                    executor = ThreadPoolExecutor(max_workers=_metadata_fetch_workers)
+                    try:
+                        for result in executor.map(lambda url: _fetch_page_metadata(url, query), candidate_urls):
+                            if result is not None:
+                                results.append(result)
+                                if len(results) >= max_results:
+                                    break
+                    finally:
+                        executor.shutdown(wait=False, cancel_futures=True)
                     
                     if results:
                         # Sort by priority and format results
                         results.sort(key=lambda x: x['priority'], reverse=True)
                         
-                        formatted_results = []
-                        for i, result in enumerate(results[:max_results]):
-                            formatted_results.append(
-                                f"Result {i+1} (Priority: {result['priority']}):\n"
-                                f"Title: {result['title']}\n"
-                                f"Description: {result['description']}\n"
-                                f"URL: {result['url']}\n"
-                            )
-                        
-                        return f"RECENT WEB SEARCH RESULTS for '{query}' (Google):\n\n" + "\n".join(formatted_results)
+                        return f"RECENT WEB SEARCH RESULTS for '{query}' (Google):\n\n" + "\n".join(
+                            f"Result {i+1} (Priority: {result['priority']}):\n"
+                            f"Title: {result['title']}\n"
+                            f"Description: {result['description']}\n"
+                            f"URL: {result['url']}\n"
+                            for i, result in enumerate(results[:max_results])
+                        )
                 else:
                     print(f"    ⚠️ Strategy {strategy_idx + 1} failed: rate limited or no results")
                     
@@ -493,6 +1153,70 @@ def _search_with_yagooglesearch(query: str, max_results: int = 10) -> str:
         raise Exception(f"Google search error: {str(e)}")
 
 
+# Expanded list of major news RSS feeds
+_rss_feeds = [
+    "https://rss.cnn.com/rss/edition.rss",
+    "https://feeds.bbci.co.uk/news/rss.xml",
+    "https://www.reuters.com/rssFeed/worldNews",
+    "https://rss.ap.org/rss/apf-topnews.rss",
+    "https://feeds.npr.org/1001/rss.xml",
+    "https://abcnews.go.com/abcnews/topstories",
+    "https://feeds.nbcnews.com/nbcnews/public/news",
+    "https://feeds.foxnews.com/foxnews/latest",
+    "https://feeds.washingtonpost.com/rss/world",
+    "https://rss.nytimes.com/services/xml/rss/nyt/World.xml",
+    "https://feeds.bloomberg.com/markets/news.rss",
+    "https://feeds.theguardian.com/theguardian/world/rss",
+    "https://feeds.politico.com/politico/rss",
+    "https://feeds.huffingtonpost.com/huffingtonpost/raw_feed",
+    "https://feeds.usatoday.com/usatoday-NewsTopStories"
+]
+
+_rss_fetch_workers = 8
+_rss_fetch_deadline_seconds = 10  # Overall budget for the feed fan-out; late feeds are skipped
+_rss_sufficient_results_factor = 3  # Stop waiting for feeds once this many entries per wanted result are found
+_feed_ttl_seconds = 90  # Feeds change every few minutes, so reuse a parsed feed briefly
+_feed_cache: Dict[str, Tuple[float, Optional[str], Optional[str], Any]] = {}  # url -> (fetched_at, etag, last_modified, parsed)
+_feed_cache_lock = threading.Lock()
+
+
+def _fetch_feed(feed_url: str, parse) -> Tuple[int, Any]:
+    """
+    Download and parse an RSS feed, returning (status_code, parsed feed or None).
+    Parsed feeds are reused for a short TTL; after that the feed is revalidated with
+    ETag / Last-Modified so an unchanged feed (304) isn't downloaded and parsed again
+    """
+    with _feed_cache_lock:
+        cached = _feed_cache.get(feed_url)
+    if cached and time.time() - cached[0] < _feed_ttl_seconds:
+        _emit("feed_cache_hit", url=feed_url)
+        return 200, cached[3]
+    
+    headers = {}
+    if cached:
+        if cached[1]:
+            headers['If-None-Match'] = cached[1]
+        if cached[2]:
+            headers['If-Modified-Since'] = cached[2]
+    
+    # Download with the shared session, then let feedparser parse the raw bytes
+    response = _http_session.get(feed_url, timeout=(_connect_timeout_seconds, 5), headers=headers)
+    if response.status_code == 304 and cached:
+        # Unchanged since last fetch: keep the old parse and restart its TTL
+        _emit("feed_not_modified", url=feed_url)
+        with _feed_cache_lock:
+            _feed_cache[feed_url] = (time.time(), cached[1], cached[2], cached[3])
+        return 200, cached[3]
+    if response.status_code >= 400:
+        return response.status_code, None
+    
+    parsed = parse(response.content)
+    with _feed_cache_lock:
+        _feed_cache[feed_url] = (time.time(), response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'), parsed)
+    return response.status_code, parsed
+
+
 def _search_with_rss_feeds(query: str, max_results: int = 10) -> str:
     """
     Search recent news using RSS feeds from major news sources
@@ -503,25 +1227,6 @@ def _search_with_rss_feeds(query: str, max_results: int = 10) -> str:
         except ImportError:
             raise Exception("feedparser package not installed. Install with: pip install feedparser")
         
-        # Expanded list of major news RSS feeds
-        rss_feeds = [
-            "https://rss.cnn.com/rss/edition.rss",
-            "https://feeds.bbci.co.uk/news/rss.xml",
-            "https://www.reuters.com/rssFeed/worldNews",
-            "https://rss.ap.org/rss/apf-topnews.rss",
-            "https://feeds.npr.org/1001/rss.xml",
-            "https://abcnews.go.com/abcnews/topstories",
-            "https://feeds.nbcnews.com/nbcnews/public/news",
-            "https://feeds.foxnews.com/foxnews/latest",
-            "https://feeds.washingtonpost.com/rss/world",
-            "https://rss.nytimes.com/services/xml/rss/nyt/World.xml",
-            "https://feeds.bloomberg.com/markets/news.rss",
-            "https://feeds.theguardian.com/theguardian/world/rss",
-            "https://feeds.politico.com/politico/rss",
-            "https://feeds.huffingtonpost.com/huffingtonpost/raw_feed",
-            "https://feeds.usatoday.com/usatoday-NewsTopStories"
-        ]
-        
         all_entries = []
         query_lower = query.lower()
         query_terms = query_lower.split()
@@ -529,83 +1234,113 @@ def _search_with_rss_feeds(query: str, max_results: int = 10) -> str:
         # Create more sophisticated search terms
         search_terms = query_terms.copy()
         
-        # Add key terms from the query for better matching
-        import re
-        capitalized_terms = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', query)
-        for term in capitalized_terms:
-            search_terms.append(term.lower())
-        
-        # Extract numbers and years for better matching
-        numbers = re.findall(r'\b\d+\b', query)
+        # Add capitalized key terms, then numbers and years, for better matching;
+        # one scan of the query finds both kinds
+        numbers = []
+        for match in _QUERY_TERMS_RE.finditer(query):
+            if match.lastgroup == 'cap':
+                search_terms.append(match.group().lower())
+            else:
+                numbers.append(match.group())
         search_terms.extend(numbers)
         
         print(f"🔍 Searching RSS feeds with terms: {search_terms[:10]}...")
         
+        # Precompute one weight per distinct term: 3 points for appearing in the content,
+        # plus 1 for a partial word match. A term without whitespace that appears in the
+        # content always lies inside a single word, so its partial match comes for free;
+        # multi-word terms can never match inside a single word.
+        term_weights = {}
+        for term in search_terms:
+            term_weights[term] = term_weights.get(term, 0) + (4 if len(term.split()) == 1 else 3)
+        # One alternation of every term rejects non-matching entries in a single scan
+        terms_pattern = re.compile('|'.join(map(re.escape, term_weights))) if term_weights else None
+        
         successful_feeds = 0
         failed_feeds = 0
         
-        for feed_url in rss_feeds:
-            try:
-                print(f"  📡 Checking feed: {feed_url}")
-                feed = feedparser.parse(feed_url)
-                
-                # Check if the feed was parsed successfully
-                if hasattr(feed, 'status') and feed.status >= 400:
-                    print(f"    ❌ Feed returned status {feed.status}")
-                    failed_feeds += 1
-                    continue
+        def fetch_feed(feed_url: str):
+            return _fetch_feed(feed_url, feedparser.parse)
+        
+        # Feeds are fetched concurrently; results are scored as they arrive
+        executor = ThreadPoolExecutor(max_workers=_rss_fetch_workers)
+        try:
+            future_to_url = {executor.submit(fetch_feed, feed_url): feed_url for feed_url in _rss_feeds}
+            
+            for future in as_completed(future_to_url, timeout=_rss_fetch_deadline_seconds):
+                feed_url = future_to_url[future]
+                try:
+                    print(f"  📡 Checked feed: {feed_url}")
+                    status_code, feed = future.result()
+                    
+                    # Check if the feed was fetched successfully
+                    if feed is None:
+                        print(f"    ❌ Feed returned status {status_code}")
+                        failed_feeds += 1
+                        continue
                 
-                if not hasattr(feed, 'entries') or not feed.entries:
-                    print(f"    ❌ No entries found in feed")
-                    failed_feeds += 1
-                    continue
+                    if not hasattr(feed, 'entries') or not feed.entries:
+                        print(f"    ❌ No entries found in feed")
+                        failed_feeds += 1
+                        continue
                 
-                feed_entries_found = 0
-                for entry in feed.entries[:50]:  # Check more entries per feed
-                    title = entry.get('title', '')
-                    summary = entry.get('summary', entry.get('description', ''))
-                    link = entry.get('link', '')
+                    feed_entries_found = 0
+                    for entry in feed.entries[:50]:  # Check more entries per feed
+                        title = entry.get('title', '')
+                        summary = entry.get('summary', entry.get('description', ''))
+                        link = entry.get('link', '')
                     
-                    # More sophisticated relevance checking
-                    content_to_check = (title + ' ' + summary).lower()
+                        # More sophisticated relevance checking
+                        content_to_check = (title + ' ' + summary).lower()
                     
-                    # Check if any search terms appear in the content
-                    relevance_score = 0
-                    for term in search_terms:
-                        if term in content_to_check:
-                            relevance_score += 3
-                        # Check for partial matches
-                        if any(term in word for word in content_to_check.split()):
-                            relevance_score += 1
+                        # Check if any search terms appear in the content
+                        if terms_pattern is None or terms_pattern.search(content_to_check) is None:
+                            continue
+                        relevance_score = sum(
+                            weight for term, weight in term_weights.items() if term in content_to_check
+                        )
                     
-                    if relevance_score > 0:
-                        # Safely extract domain from URL
-                        try:
-                            from urllib.parse import urlparse
-                            parsed_url = urlparse(feed_url)
-                            domain = parsed_url.netloc or feed_url
-                        except Exception:
-                            domain = feed_url
+                        if relevance_score > 0:
+                            # Safely extract domain from URL
+                            try:
+                                parsed_url = urlparse(feed_url)
+                                domain = parsed_url.netloc or feed_url
+                            except Exception:
+                                domain = feed_url
                         
-                        all_entries.append({
-                            'title': title,
-                            'summary': summary,
-                            'link': link,
-                            'source': domain,
-                            'relevance': relevance_score
-                        })
-                        feed_entries_found += 1
+                            all_entries.append({
+                                'title': title,
+                                'summary': summary,
+                                'link': link,
+                                'source': domain,
+                                'relevance': relevance_score
+                            })
+                            feed_entries_found += 1
                 
-                if feed_entries_found > 0:
-                    print(f"    ✅ Found {feed_entries_found} relevant entries")
-                    successful_feeds += 1
-                else:
-                    print(f"    ⚠️ No relevant entries found")
+                    if feed_entries_found > 0:
+                        print(f"    ✅ Found {feed_entries_found} relevant entries")
+                        successful_feeds += 1
+                    else:
+                        print(f"    ⚠️ No relevant entries found")
                     
-            except Exception as e:
-                print(f"    ❌ Failed to parse RSS feed {feed_url}: {e}")
-                failed_feeds += 1
-                continue
+                except Exception as e:
+                    print(f"    ❌ Failed to parse RSS feed {feed_url}: {e}")
+                    failed_feeds += 1
+                    continue
+                
+                # Enough candidates to rank; don't wait for the slower feeds
+                if len(all_entries) >= max_results * _rss_sufficient_results_factor:
+                    remaining_feeds = sum(1 for future in future_to_url if not future.done())
+                    if remaining_feeds:
+                        print(f"  ⏩ {len(all_entries)} relevant entries found, skipping {remaining_feeds} remaining feeds")
+                    break
+        except TimeoutError:
+            # Score whatever arrived in time instead of waiting on the slowest feed
+            pending_feeds = sum(1 for future in future_to_url if not future.done())
+            print(f"  ⏱️ {pending_feeds} feeds still loading after {_rss_fetch_deadline_seconds}s, skipping them")
+            failed_feeds += pending_feeds
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         print(f"📊 RSS Search Summary: {successful_feeds} successful feeds, {failed_feeds} failed feeds")
         
@@ -617,17 +1352,14 @@ def _search_with_rss_feeds(query: str, max_results: int = 10) -> str:
         top_entries = all_entries[:max_results]
         
         # Format results
-        formatted_results = []
-        for i, entry in enumerate(top_entries):
-            formatted_results.append(
-                f"Result {i+1} (Relevance: {entry['relevance']}):\n"
-                f"Title: {entry['title']}\n"
-                f"Description: {entry['summary'][:300]}...\n"
-                f"URL: {entry['link']}\n"
-                f"Source: {entry['source']}\n"
-            )
-        
-        return f"RECENT NEWS from RSS FEEDS for '{query}':\n\n" + "\n".join(formatted_results)
+        return f"RECENT NEWS from RSS FEEDS for '{query}':\n\n" + "\n".join(
+            f"Result {i+1} (Relevance: {entry['relevance']}):\n"
+            f"Title: {entry['title']}\n"
+            f"Description: {entry['summary'][:300]}...\n"
+            f"URL: {entry['link']}\n"
+            f"Source: {entry['source']}\n"
+            for i, entry in enumerate(top_entries)
+        )
         
     except Exception as e:
         raise Exception(f"RSS feed search error: {str(e)}")
@@ -638,8 +1370,6 @@ def _search_with_news_scraper(query: str, max_results: int = 10) -> str:
     Scrape news from aggregator sites
     """
     try:
-        from bs4 import BeautifulSoup
-        
         # Try scraping from news aggregator sites
         aggregators = [
             "https://news.google.com/search?q=" + query.replace(' ', '%20'),
@@ -650,17 +1380,15 @@ def _search_with_news_scraper(query: str, max_results: int = 10) -> str:
         
         for url in aggregators:
             try:
-                response = requests.get(url, timeout=10, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
+                response = _http_session.get(url, timeout=(_connect_timeout_seconds, 10))
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Look for article-like elements
-                    articles = soup.find_all(['article', 'div'], class_=re.compile(r'(article|news|story|item)', re.I))
+                    # Look for article-like elements; the strainer keeps only those subtrees
+                    soup = BeautifulSoup(response.content, _HTML_PARSER, parse_only=_ARTICLE_STRAINER)
+                    # Only the first max_results are used, so stop the search there
+                    articles = soup.find_all(['article', 'div'], class_=_ARTICLE_CLASS_RE, limit=max_results)
                     
-                    for article in articles[:max_results]:
+                    for article in articles:
                         title_elem = article.find(['h1', 'h2', 'h3', 'h4'], text=True)
                         link_elem = article.find('a', href=True)
                         
@@ -670,12 +1398,10 @@ def _search_with_news_scraper(query: str, max_results: int = 10) -> str:
                             
                             # Make relative URLs absolute
                             if link.startswith('/'):
-                                from urllib.parse import urljoin
                                 link = urljoin(url, link)
                             
                             # Safely extract domain from URL
                             try:
-                                from urllib.parse import urlparse
                                 parsed_url = urlparse(url)
                                 domain = parsed_url.netloc or url
                             except Exception:
@@ -694,188 +1420,147 @@ def _search_with_news_scraper(query: str, max_results: int = 10) -> str:
         if not all_articles:
             return "No articles found through web scraping"
         
-        # Remove duplicates and format results
-        seen_urls = set()
-        unique_articles = []
-        
+        # Remove duplicates (the first article for each URL wins) and format results
+        unique_articles = {}
         for article in all_articles:
-            if article['url'] not in seen_urls:
-                seen_urls.add(article['url'])
-                unique_articles.append(article)
-                
-        unique_articles = unique_articles[:max_results]
+            unique_articles.setdefault(article['url'], article)
         
-        formatted_results = []
-        for i, article in enumerate(unique_articles):
-            formatted_results.append(
-                f"Result {i+1}:\n"
-                f"Title: {article['title']}\n"
-                f"URL: {article['url']}\n"
-                f"Source: {article['source']}\n"
-            )
-        
-        return f"RECENT NEWS from WEB SCRAPING for '{query}':\n\n" + "\n".join(formatted_results)
+        return f"RECENT NEWS from WEB SCRAPING for '{query}':\n\n" + "\n".join(
+            f"Result {i+1}:\n"
+            f"Title: {article['title']}\n"
+            f"URL: {article['url']}\n"
+            f"Source: {article['source']}\n"
+            for i, article in enumerate(list(unique_articles.values())[:max_results])
+        )
         
-    except ImportError:
-        raise Exception("BeautifulSoup package not installed")
     except Exception as e:
         raise Exception(f"News scraping error: {str(e)}")
 
 
-
-
-def _calculate_relevance_score(text: str, query: str) -> int:
+def _keyword_re(keywords: List[str]) -> re.Pattern:
     """
-    Calculate relevance score for RSS feed entries
+    Compile a keyword list into a single alternation so text is scanned once instead of once per keyword.
+    The lookahead makes finditer report overlapping matches too
     """
-    score = 0
-    text_lower = text.lower()
-    query_terms = query.lower().split()
-    
-    for term in query_terms:
-        # Exact term matches
-        score += text_lower.count(term) * 3
-        
-        # Partial matches
-        for word in text_lower.split():
-            if term in word:
-                score += 1
-    
-    return score
+    return re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))')
+
+
+def _distinct_keywords(pattern: re.Pattern, text: str) -> set:
+    """Distinct keywords from a _keyword_re pattern that occur in text"""
+    return {match.group(1) for match in pattern.finditer(text)}
+
+
+# Skip social media and low-quality sources
+_SKIP_DOMAINS_RE = _keyword_re([
+    'twitter.com', 'x.com', 'facebook.com', 'instagram.com', 'tiktok.com',
+    'pinterest.com', 'reddit.com', 'youtube.com', 'youtu.be',
+    'blogspot.com', 'wordpress.com', 'medium.com/@'  # Skip personal blogs
+])
+
+# Keyword classes used to rank search results
+_OFFICIAL_DOMAINS_RE = _keyword_re(['.gov', '.edu', '.org'])
+_NEWS_DOMAINS_RE = _keyword_re([
+    'reuters.com', 'ap.org', 'cnn.com', 'nytimes.com', 'washingtonpost.com',
+    'bbc.com', 'npr.org', 'wsj.com', 'guardian.com', 'bloomberg.com'
+])
+_NEWS_INDICATORS_RE = _keyword_re(['news', 'press', 'times', 'post', 'journal', 'herald'])
+_RECENT_WORDS_RE = _keyword_re(['2024', '2025', 'latest', 'breaking', 'just', 'new', 'recent', 'today'])
+_QUALITY_WORDS_RE = _keyword_re(['official', 'announcement', 'confirmed', 'verified', 'statement'])
+
 
+_WORD_RE = re.compile(r'\w+')
+_phrase_match_threshold = 0.85  # Share of the phrase's words that must appear in the text
 
-def _build_comprehensive_search_query(original_query: str) -> str:
+
+@functools.lru_cache(maxsize=256)
+def _phrase_words(phrase: str) -> Tuple[str, ...]:
+    """Words of a query phrase, cached because one phrase is checked against every search result"""
+    return tuple(_WORD_RE.findall(phrase))
+
+
+def _phrase_matches(phrase: str, text: str) -> bool:
     """
-    Build a single comprehensive search query instead of multiple separate queries
-    This reduces API calls and improves efficiency
+    Near-match check for a query phrase: it appears verbatim, or nearly all of its words
+    appear in the text, which tolerates extra whitespace, punctuation and reordering
     """
-    import re
-    
-    # Increased query length limit to allow for more detailed searches
-    query = original_query.strip()[:300]  # Increased from 150 to 300 characters
-    
-    # Remove problematic characters that might cause search issues
-    query = query.replace('```', '').replace('"', '').strip()
-    
-    # If query is too short, return it as-is to avoid over-complicating simple queries
-    if len(query) < 10:
-        return query
-    
-    # Extract important elements from the query to build a more targeted search
-    capitalized_terms = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', query)
-    years = re.findall(r'\b(20[0-9]{2})\b', query)
-    numbers = re.findall(r'\b\d+\b', query)
-    
-    # Remove years from numbers to avoid duplication
-    non_year_numbers = [num for num in numbers if num not in years]
-    
-    # Build a comprehensive query that covers what the multiple queries were trying to achieve
-    # Instead of 4 separate API calls, use search operators in a single call
-    query_parts = [f'"{query}"']
-    
-    # Add capitalized terms (likely proper nouns, names, places) for more specific searches
-    if capitalized_terms:
-        for term in capitalized_terms[:3]:  # Limit to avoid overly long queries
-            query_parts.append(f'"{term}"')
-    
-    # Add year-specific searches if years are found (but only if not already in query)
-    if years:
-        for year in years[:2]:  # Limit to avoid overly long queries
-            # Only add if this year isn't already mentioned in the original query
-            if year not in original_query:
-                query_parts.append(f'({query} {year})')
-    
-    # Add recency indicators (2024/2025) unless they're already present in the query
-    if '2024' not in original_query:
-        query_parts.append(f'({query} 2024)')
-    if '2025' not in original_query:
-        query_parts.append(f'({query} 2025)')
-    
-    # Add non-year numbers for more specific searches (could be important figures, statistics, etc.)
-    if non_year_numbers:
-        for num in non_year_numbers[:2]:  # Limit to avoid overly long queries
-            # Only add if this number isn't already mentioned in the original query
-            if num not in original_query:
-                query_parts.append(f'("{query} {num}")')
-    
-    # Add context-specific searches
-    query_parts.append(f'({query} news)')
-    query_parts.append(f'({query} official)')
-    
-    # Join all parts with OR to create comprehensive search
-    enhanced_query = ' OR '.join(query_parts)
-    
-    return enhanced_query
+    if phrase in text:
+        return True
+    phrase_words = _phrase_words(phrase)
+    if not phrase_words:
+        return False
+    text_words = set(_WORD_RE.findall(text))
+    matched = sum(1 for word in phrase_words if word in text_words)
+    return matched / len(phrase_words) >= _phrase_match_threshold
 
 
 def _should_skip_url(url: str) -> bool:
     """
     Determine if a URL should be skipped based on domain/quality
     """
-    url_lower = url.lower()
-    
-    # Skip social media and low-quality sources
-    skip_domains = [
-        'twitter.com', 'x.com', 'facebook.com', 'instagram.com', 'tiktok.com',
-        'pinterest.com', 'reddit.com', 'youtube.com', 'youtu.be',
-        'blogspot.com', 'wordpress.com', 'medium.com/@'  # Skip personal blogs
-    ]
-    
-    return any(domain in url_lower for domain in skip_domains)
+    return _SKIP_DOMAINS_RE.search(url.lower()) is not None
 
 
-def _calculate_priority_score(title: str, body: str, url: str, original_query: str) -> int:
+def _url_prior(url: str) -> int:
     """
-    Calculate a priority score for search results based on multiple factors
+    Score a source by its domain alone, without any network access
     """
     score = 0
-    title_lower = title.lower()
-    body_lower = body.lower()
     url_lower = url.lower()
-    query_lower = original_query.lower()
     
     # Official and credible sources get high priority
-    if any(domain in url_lower for domain in ['.gov', '.edu', '.org']):
+    if _OFFICIAL_DOMAINS_RE.search(url_lower):
         score += 15
     
     # Major news sources get high priority
-    news_domains = [
-        'reuters.com', 'ap.org', 'cnn.com', 'nytimes.com', 'washingtonpost.com', 
-        'bbc.com', 'npr.org', 'wsj.com', 'guardian.com', 'bloomberg.com'
-    ]
-    if any(domain in url_lower for domain in news_domains):
+    if _NEWS_DOMAINS_RE.search(url_lower):
         score += 12
     
     # Other news sources get medium priority
-    news_indicators = ['news', 'press', 'times', 'post', 'journal', 'herald']
-    if any(indicator in url_lower for indicator in news_indicators):
+    if _NEWS_INDICATORS_RE.search(url_lower):
         score += 8
     
+    return score
+
+
+def _calculate_priority_score(title: str, body: str, url: str, original_query: str) -> int:
+    """
+    Calculate a priority score for search results based on multiple factors
+    """
+    title_lower = title.lower()
+    body_lower = body.lower()
+    query_lower = original_query.lower()
+    
+    score = _url_prior(url)
+    
     # Recency indicators in title
-    recent_words = ['2024', '2025', 'latest', 'breaking', 'just', 'new', 'recent', 'today']
-    score += sum(3 for word in recent_words if word in title_lower)
+    score += 3 * len(_distinct_keywords(_RECENT_WORDS_RE, title_lower))
     
     # Recency indicators in description
-    score += sum(2 for word in recent_words if word in body_lower)
+    score += 2 * len(_distinct_keywords(_RECENT_WORDS_RE, body_lower))
     
-    # Query relevance - exact phrase matches
-    if query_lower[:50] in title_lower:  # Limit query length for comparison
+    # Query relevance - phrase matches, tolerating small differences
+    query_phrase = query_lower[:50]  # Limit query length for comparison
+    if _phrase_matches(query_phrase, title_lower):
         score += 10
-    if query_lower[:50] in body_lower:
+    if _phrase_matches(query_phrase, body_lower):
         score += 5
     
     # Quality indicators
-    quality_words = ['official', 'announcement', 'confirmed', 'verified', 'statement']
-    score += sum(2 for word in quality_words if word in title_lower or word in body_lower)
+    quality_words = _distinct_keywords(_QUALITY_WORDS_RE, title_lower) | _distinct_keywords(_QUALITY_WORDS_RE, body_lower)
+    score += 2 * len(quality_words)
     
     return score
 
-def get_gemini_search_response(prompt: str, temperature: float = 0.8):
+_CODE_FENCE_RE = re.compile(r'```\s*([^`]+)\s*```', re.DOTALL)
+# Links, handles and hashtags are noise in a search query; removed in one pass. A handle or
+# hashtag stops where a link starts, matching removal of the links before the handles
+_SEARCH_NOISE_RE = re.compile(r'https?://\S+|[@#](?:(?!https?://\S)\w)+')
+
+
+def _extract_search_query_text(prompt: str) -> str:
     """
-    Get a response from Gemini with enhanced search capabilities.
-    Always performs web search to get the most current information available.
+    Pull the post text out of a note-writing prompt so it can be used as a web search query
     """
-    
     # Extract key terms for web search from the post content with improved logic
     lines = prompt.split('\n')
     post_text = ""
@@ -883,11 +1568,9 @@ def get_gemini_search_response(prompt: str, temperature: float = 0.8):
     # Look for the post text section with multiple possible formats
     post_text_indicators = ['Post text:', 'post text:', 'POST TEXT:']
     
-    for line in lines:
+    for start_idx, line in enumerate(lines):
         if any(indicator in line for indicator in post_text_indicators):
-            # Find the post text section
-            start_idx = lines.index(line)
-            
+            # Found the post text section
             # Extract text from multiple lines after the indicator
             for i in range(start_idx + 1, min(start_idx + 20, len(lines))):
                 if i < len(lines):
@@ -905,10 +1588,8 @@ def get_gemini_search_response(prompt: str, temperature: float = 0.8):
     # If no explicit post text found, try to extract from the entire prompt
     if not post_text.strip():
         # Look for quoted content or text that looks like a post
-        import re
-        
         # Try to find text within quotes or after certain patterns
-        quote_matches = re.findall(r'```\s*([^`]+)\s*```', prompt, re.DOTALL)
+        quote_matches = _CODE_FENCE_RE.findall(prompt)
         if quote_matches:
             post_text = quote_matches[0].strip()
         else:
@@ -920,10 +1601,17 @@ def get_gemini_search_response(prompt: str, temperature: float = 0.8):
     # Clean and prepare the search query
     if post_text.strip():
         # Remove URLs and handles from the post text for better searching
-        post_text = re.sub(r'https?://\S+', '', post_text)
-        post_text = re.sub(r'@\w+', '', post_text)
-        post_text = re.sub(r'#\w+', '', post_text)
-        post_text = post_text.strip()
+        post_text = _SEARCH_NOISE_RE.sub('', post_text).strip()
+    
+    return post_text
+
+
+def search_for_prompt(prompt: str) -> str:
+    """
+    Run a web search based on the post text in the prompt.
+    Returns the search results, or "" if there was nothing to search with or the search failed
+    """
+    post_text = _extract_search_query_text(prompt)
     
     # Always perform web search for current information
     web_results = ""
@@ -941,7 +1629,13 @@ def get_gemini_search_response(prompt: str, temperature: float = 0.8):
     else:
         print("⚠️ No post text found to search with")
     
-    # Get Gemini's response with enhanced prompt including web search results
+    return web_results
+
+
+def _build_search_enhanced_prompt(prompt: str, web_results: str) -> str:
+    """
+    Append web search results to the prompt so Gemini prefers them over its training data
+    """
     enhanced_prompt = prompt
     if web_results:
         enhanced_prompt = f"""{prompt}
@@ -952,48 +1646,87 @@ def get_gemini_search_response(prompt: str, temperature: float = 0.8):
 CRITICAL INSTRUCTION: When fact-checking, prioritize information from the WEB SEARCH RESULTS above, as it contains the most current and up-to-date information available. If there's any conflict between your training data and the web search results, defer to the web search results for recent events and current status information.
 """
     
-    gemini_response = _make_request(enhanced_prompt, temperature)
-    
-    return gemini_response
+    return enhanced_prompt
+
+
+def _cached_search_response(search_key: str) -> Optional[str]:
+    cached_response = _search_response_cache.get(search_key)
+    if cached_response is None:
+        _emit('search_response_cache_miss')
+    else:
+        _emit('search_response_cache_hit')
+        print("📋 Using cached search-grounded response")
+    return cached_response
+
+
+def _store_search_response(search_key: str, web_results: str, response_text: Optional[str]):
+    if response_text is None:
+        return
+    # An answer written without web results is only reused within this run
+    _search_response_cache.set(search_key, response_text, persist=bool(web_results))
+
+
+def get_gemini_search_response(prompt: str, temperature: float = 0.8, web_results: Optional[str] = None):
+    """
+    Get a response from Gemini with enhanced search capabilities.
+    Always performs web search to get the most current information available,
+    unless web_results from an earlier search_for_prompt call are passed in.
+    """
+    search_key = _request_key("search", _gemini_model, temperature, prompt)
+    cached_response = _cached_search_response(search_key)
+    if cached_response is not None:
+        return cached_response
+    
+    if web_results is None:
+        web_results = search_for_prompt(prompt)
+    response_text = _make_request(_build_search_enhanced_prompt(prompt, web_results), temperature)
+    _store_search_response(search_key, web_results, response_text)
+    return response_text
 
 
 def extract_urls_from_text(text: str) -> List[str]:
     """
     Extract all URLs from text using regex pattern
     """
-    # Pattern to match URLs with various protocols and formats
-    # Excludes common punctuation that might be at the end of URLs in text
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]()]+(?:\([^\s<>"{}|\\^`\[\]()]*\))?[^\s<>"{}|\\^`\[\]()]*|www\.[^\s<>"{}|\\^`\[\]()]+|[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.[a-zA-Z]{2,}(?:/[^\s<>"{}|\\^`\[\]()]*)?'
-    raw_urls = re.findall(url_pattern, text)
-    
-    # Clean URLs by removing trailing punctuation
-    cleaned_urls = []
-    for url in raw_urls:
+    # Clean, normalize and deduplicate in a single pass; the dict keeps first-seen order
+    unique_urls = {}
+    for url in _URL_RE.findall(text):
         # Remove trailing punctuation that's commonly at the end of sentences
-        cleaned_url = re.sub(r'[)\].,;:!?]+$', '', url.strip())
-        if cleaned_url:
-            cleaned_urls.append(cleaned_url)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_urls = []
-    for url in cleaned_urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append(url)
-    
-    # Normalize URLs - add https:// if missing
-    normalized_urls = []
-    for url in unique_urls:
+        url = _TRAILING_PUNCT_RE.sub('', url.strip())
+        if not url:
+            continue
+        # Normalize URLs - add https:// if missing
         if not url.startswith(('http://', 'https://')):
-            if url.startswith('www.'):
-                normalized_urls.append(f'https://{url}')
-            else:
-                normalized_urls.append(f'https://{url}')
-        else:
-            normalized_urls.append(url)
+            url = f'https://{url}'
+        unique_urls[url] = None
     
-    return normalized_urls
+    return list(unique_urls)
+
+
+_page_content_max_chars = 50000  # Limit to ~50KB of text per page
+_page_content_max_bytes = 64 * 1024  # Enough raw bytes for the character limit on typical pages
+
+# Fetched pages, so a source cited by several posts is only downloaded once an hour.
+# Pages are up to ~50 KB each, so fewer are kept in memory than in the other caches.
+# With NOTE_WRITER_HTTP_CACHE=1 they are also shared across runs
+_page_cache_max_entries = 128
+_page_cache = _TTLCache(_page_cache_max_entries, 3600,  # 1 hour
+                        backing=_persistent_cache("pages", 3600))
+
+
+_per_host_fetch_limit = 2  # Concurrent page fetches allowed against a single host
+_host_semaphores: Dict[str, threading.Semaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(url: str) -> threading.Semaphore:
+    """Semaphore limiting concurrent page fetches to the host of url"""
+    host = urlsplit(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = _host_semaphores[host] = threading.Semaphore(_per_host_fetch_limit)
+        return semaphore
 
 
 def fetch_page_content(url: str, timeout: int = 10) -> Tuple[Optional[str], int, str]:
@@ -1001,36 +1734,34 @@ def fetch_page_content(url: str, timeout: int = 10) -> Tuple[Optional[str], int,
     Fetch page content from URL and return (content, status_code, error_message)
     Returns (None, status_code, error_message) if failed
     """
+    cached_content = _page_cache.get(url)
+    if cached_content is not None:
+        _emit("page_cache_hit", url=url)
+        return cached_content, 200, ""
+    
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
+        # Pooled session: links to the same domain reuse one keep-alive connection.
+        # Streamed so only the part of the page we keep is downloaded and decoded.
+        # Parallel fetches to one host are capped so we don't hammer (or get blocked by) it
+        with _host_semaphore(url), _http_session.get(url, timeout=(_connect_timeout_seconds, timeout), headers=headers, allow_redirects=True, stream=True) as response:
+            # Check if we got a successful response
+            if response.status_code != 200:
+                return None, response.status_code, f"HTTP {response.status_code}"
+            
+            content, truncated = _read_text_limited(response, _page_content_max_bytes)
         
-        # Check if we got a successful response
-        if response.status_code == 200:
-            # Try to get text content with proper encoding handling
-            try:
-                # Try to use the response's encoding if available
-                if response.encoding:
-                    content = response.content.decode(response.encoding, errors='replace')
-                else:
-                    # Try UTF-8 as fallback
-                    content = response.content.decode('utf-8', errors='replace')
-                    
-                # Limit content length to avoid overwhelming Gemini
-                if len(content) > 50000:  # Limit to ~50KB
-                    content = content[:50000] + "... [content truncated]"
-                return content, response.status_code, ""
-            except UnicodeDecodeError:
-                # If decoding fails, use response.text as fallback
-                content = response.text
-                if len(content) > 50000:
-                    content = content[:50000] + "... [content truncated]"
-                return content, response.status_code, ""
-        else:
-            return None, response.status_code, f"HTTP {response.status_code}"
+        # Limit content length to avoid overwhelming Gemini
+        if len(content) > _page_content_max_chars:
+            content = content[:_page_content_max_chars]
+            truncated = True
+        if truncated:
+            content += "... [content truncated]"
+        _page_cache.set(url, content)
+        return content, 200, ""
             
     except requests.exceptions.Timeout:
         return None, 0, "Request timeout"
@@ -1042,86 +1773,97 @@ def fetch_page_content(url: str, timeout: int = 10) -> Tuple[Optional[str], int,
         return None, 0, f"Error: {str(e)}"
 
 
+_current_keywords = [
+    # Time indicators
+    '2024', '2025', 'recent', 'latest', 'just', 'new', 'current', 'now', 'today', 'yesterday',
+    'this year', 'last year', 'recently', 'breaking', 'announced', 'declared', 'signed',
+
+    # Political/election keywords
+    'mayor', 'election', 'primary', 'candidate', 'running for', 'campaign', 'elected',
+    'won', 'victory', 'defeated', 'conceded', 'nominee', 'race', 'vote', 'ballot',
+
+    # Government/policy keywords
+    'bill', 'law', 'policy', 'administration', 'congress', 'senate', 'house',
+    'governor', 'president', 'passed', 'legislation', 'executive order',
+
+    # Status change keywords
+    'is now', 'has become', 'appointed', 'resigned', 'stepped down', 'takes office',
+    'announced', 'confirmed', 'approved', 'rejected', 'withdrew', 'endorsed'
+]
+# Keywords must be whole words, optionally inflected: "elections" or "voted" match, while
+# "know", "nowhere", "lawn", "billion" or "newspaper" don't
+_CURRENT_KEYWORDS_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, _current_keywords)) + r')(?:s|es|d|ed|ing)?\b', re.I
+)
+
+
 def _needs_current_verification(text: str) -> bool:
     """
     Determine if the content likely contains claims that need current verification
     """
-    current_keywords = [
-        # Time indicators
-        '2024', '2025', 'recent', 'latest', 'just', 'new', 'current', 'now', 'today', 'yesterday',
-        'this year', 'last year', 'recently', 'breaking', 'announced', 'declared', 'signed',
-        
-        # Political/election keywords
-        'mayor', 'election', 'primary', 'candidate', 'running for', 'campaign', 'elected',
-        'won', 'victory', 'defeated', 'conceded', 'nominee', 'race', 'vote', 'ballot',
-        
-        # Government/policy keywords
-        'bill', 'law', 'policy', 'administration', 'congress', 'senate', 'house',
-        'governor', 'president', 'passed', 'legislation', 'executive order',
-        
-        # Status change keywords
-        'is now', 'has become', 'appointed', 'resigned', 'stepped down', 'takes office',
-        'announced', 'confirmed', 'approved', 'rejected', 'withdrew', 'endorsed'
-    ]
-    
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in current_keywords)
+    return _CURRENT_KEYWORDS_RE.search(text) is not None
 
-def validate_page_content_with_gemini(url: str, content: str, original_claim: str) -> Tuple[bool, str]:
+# Twitter/X hosts whose pages may show a deleted or suspended post instead of content
+_TWITTER_URL_RE = re.compile(r'https?://(?:www\.|mobile\.|m\.)?(?:twitter\.com|x\.com)(?:[/?#]|$)', re.I)
+
+# Messages Twitter/X shows in place of a deleted, suspended or restricted post.
+# Only the first hit matters, so a plain case-insensitive alternation is enough and the
+# page doesn't need lowercasing first
+_TWITTER_DELETED_RE = re.compile('|'.join(map(re.escape, [
+    "this post is from a suspended account",
+    "this post has been deleted",
+    "this tweet is unavailable", 
+    "this account owner limits who can view",
+    "tweet not found",
+    "post not found",
+    "account suspended",
+    "page doesn't exist",
+    "something went wrong",
+    "try again",
+    "hmm...this page doesn't exist",
+    "sorry, you are not authorized to see this status",
+    "this tweet was deleted"
+])), re.I)
+
+
+# Only the start of a page and claim are sent to Gemini; slice once and reuse the slices
+_validation_content_chars = 3000
+_validation_claim_chars = 500
+
+
+def _deleted_post_verdict(url: str, content: str) -> Optional[Tuple[bool, str]]:
     """
-    Use Gemini to validate if page content is relevant and not a 404/error page
-    Returns (is_valid, explanation)
+    Check for common indicators of deleted/eliminated Twitter/X posts without asking Gemini
     """
-    
-    # Check if this is a Twitter/X URL that might be deleted/eliminated
-    parsed_url = urlparse(url.lower())
-    is_twitter_url = parsed_url.netloc in ['twitter.com', 'x.com', 'www.twitter.com', 'www.x.com', 'mobile.twitter.com', 'm.twitter.com']
-    
-    # Check for common indicators of deleted/eliminated Twitter posts
-    if is_twitter_url:
-        deleted_indicators = [
-            "this post is from a suspended account",
-            "this post has been deleted",
-            "this tweet is unavailable", 
-            "this account owner limits who can view",
-            "tweet not found",
-            "post not found",
-            "account suspended",
-            "page doesn't exist",
-            "something went wrong",
-            "try again",
-            "hmm...this page doesn't exist",
-            "sorry, you are not authorized to see this status",
-            "this tweet was deleted"
-        ]
-        
-        content_lower = content.lower()
-        for indicator in deleted_indicators:
-            if indicator in content_lower:
-                return False, f"Eliminated/deleted Twitter/X post: {indicator}"
-    
-    # Enhanced validation for current events
-    needs_current_info = _needs_current_verification(original_claim)
-    
-    prompt = f"""You are validating whether a web page is useful as a source for fact-checking.
+    if _TWITTER_URL_RE.match(url):
+        deleted_match = _TWITTER_DELETED_RE.search(content)
+        if deleted_match:
+            return False, f"Eliminated/deleted Twitter/X post: {deleted_match.group(0).lower()}"
+    return None
 
-Original claim/context: {original_claim[:500]}...
 
-URL: {url}
+def _cached_verdict(validation_key: str) -> Optional[Tuple[bool, str]]:
+    """Cached (is_valid, explanation) verdict, or None; verdicts read back from disk come out of JSON as lists"""
+    verdict = _validation_cache.get(validation_key)
+    return tuple(verdict) if verdict is not None else None
 
-Page content (first part):
-{content[:3000]}...
 
-IMPORTANT: Pay special attention to the current date context. Today is 2025, so be very careful about claims involving recent events from late 2024 through 2025.
+def _validation_key(url: str, snippet: str, claim_snippet: str, needs_current_info: bool) -> str:
+    """Key a validation verdict on exactly the inputs that end up in the prompt"""
+    return _request_key(url, snippet, claim_snippet, needs_current_info)
 
-{"EXTRA SCRUTINY REQUIRED: The original claim appears to involve recent events or current status that may have changed. This page MUST contain current, up-to-date information to be valid." if needs_current_info else ""}
 
-Please analyze this page and respond with exactly one of these formats:
+# The conditional prompt sections depend only on the flag, so each variant is built once
+@functools.lru_cache(maxsize=2)
+def _validation_context(needs_current_info: bool) -> str:
+    return f"""IMPORTANT: Pay special attention to the current date context. Today is 2025, so be very careful about claims involving recent events from late 2024 through 2025.
 
-VALID: [brief explanation of why this page is a good source]
-INVALID: [brief explanation of why this page is not useful - e.g., 404 error, irrelevant content, broken page, deleted social media post, etc.]
+{"EXTRA SCRUTINY REQUIRED: The original claim appears to involve recent events or current status that may have changed. This page MUST contain current, up-to-date information to be valid." if needs_current_info else ""}"""
 
-The page should be considered INVALID ONLY if:
+
+@functools.lru_cache(maxsize=2)
+def _validation_criteria(needs_current_info: bool) -> str:
+    return f"""The page should be considered INVALID ONLY if:
 - It's clearly a 404 or error page
 - It's completely irrelevant to the original claim (no connection at all)
 - It's a deleted/eliminated social media post (Twitter/X)
@@ -1140,6 +1882,66 @@ The page should be considered VALID if:
 BE GENEROUS in validation - if there's ANY doubt about whether the page could be useful, mark it as VALID. We want to include sources that could potentially help with fact-checking rather than being overly restrictive.
 """
 
+
+# Validation prompts start with these fixed instructions and end with the claim and page
+# content, so consecutive requests share a long identical prefix that Gemini can cache
+@functools.lru_cache(maxsize=2)
+def _page_validation_instructions(needs_current_info: bool) -> str:
+    return f"""You are validating whether a web page is useful as a source for fact-checking.
+
+{_validation_context(needs_current_info)}
+
+Please analyze the page below and respond with exactly one of these formats:
+
+VALID: [brief explanation of why this page is a good source]
+INVALID: [brief explanation of why this page is not useful - e.g., 404 error, irrelevant content, broken page, deleted social media post, etc.]
+
+{_validation_criteria(needs_current_info)}"""
+
+
+@functools.lru_cache(maxsize=2)
+def _batch_validation_instructions(needs_current_info: bool) -> str:
+    return f"""You are validating whether each of several web pages is useful as a source for fact-checking.
+
+{_validation_context(needs_current_info)}
+
+Analyze every page below independently and respond ONLY with a JSON array containing exactly one object per page, in this format:
+
+[{{"page": 1, "valid": true, "reason": "brief explanation of why the page is or isn't a good source"}}]
+
+{_validation_criteria(needs_current_info)}"""
+
+
+def validate_page_content_with_gemini(url: str, content: str, original_claim: str) -> Tuple[bool, str]:
+    """
+    Use Gemini to validate if page content is relevant and not a 404/error page
+    Returns (is_valid, explanation)
+    """
+    snippet = content[:_validation_content_chars]
+    claim_snippet = original_claim[:_validation_claim_chars]
+    
+    # Deleted-post messages sit at the top of the page, so the snippet is enough
+    deleted_verdict = _deleted_post_verdict(url, snippet)
+    if deleted_verdict is not None:
+        return deleted_verdict
+    
+    # Enhanced validation for current events
+    needs_current_info = _needs_current_verification(original_claim)
+    
+    validation_key = _validation_key(url, snippet, claim_snippet, needs_current_info)
+    cached_validation = _cached_verdict(validation_key)
+    if cached_validation is not None:
+        _emit("validation_cache_hit", url=url)
+        return cached_validation
+    
+    prompt = f"""{_page_validation_instructions(needs_current_info)}
+Original claim/context: {claim_snippet}...
+
+URL: {url}
+
+Page content (first part):
+{snippet}..."""
+
     try:
         response = get_gemini_response(prompt, temperature=0.3)
         if response is None:
@@ -1147,17 +1949,226 @@ BE GENEROUS in validation - if there's ANY doubt about whether the page could be
         
         response = response.strip()
         if response.startswith("VALID:"):
-            return True, response[6:].strip()
+            validation = (True, response[6:].strip())
         elif response.startswith("INVALID:"):
-            return False, response[8:].strip()
+            validation = (False, response[8:].strip())
         else:
             # If format is unexpected, err on the side of caution
             return False, f"Unexpected validation response format: {response[:100]}"
+        
+        # Only clear verdicts are cached; errors and odd formats get a fresh attempt next time
+        _validation_cache.set(validation_key, validation)
+        return validation
             
     except Exception as e:
         return False, f"Error validating with Gemini: {str(e)}"
 
 
+# Line-per-page verdicts ("1: VALID: reason"), which the model sometimes returns instead of JSON
+_BATCH_VERDICT_LINE_RE = re.compile(
+    r'^[\s*#-]*(?:PAGE\s*)?(\d+)\s*[:.)-]\s*\**(VALID|INVALID)\b\**\s*[:-]?\s*(.*)$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _parse_batch_validation(response: Optional[str], page_count: int) -> Dict[int, Tuple[bool, str]]:
+    """
+    Parse the JSON array returned for a batch validation into {page_number: (is_valid, explanation)},
+    falling back to line-per-page verdicts if there is no usable array.
+    Malformed or missing entries are simply left out
+    """
+    if not response:
+        return {}
+    
+    verdicts = _parse_batch_validation_json(response, page_count)
+    if verdicts:
+        return verdicts
+    
+    for match in _BATCH_VERDICT_LINE_RE.finditer(response):
+        page = int(match.group(1))
+        if 1 <= page <= page_count and page not in verdicts:
+            verdicts[page] = (match.group(2).upper() == 'VALID', match.group(3).strip())
+    return verdicts
+
+
+def _parse_batch_validation_json(response: str, page_count: int) -> Dict[int, Tuple[bool, str]]:
+    # The array may be wrapped in a code fence or surrounded by extra text
+    start, end = response.find('['), response.rfind(']')
+    if start == -1 or end <= start:
+        return {}
+    try:
+        entries = json.loads(response[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(entries, list):
+        return {}
+    
+    verdicts = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        page = entry.get('page')
+        is_valid = entry.get('valid')
+        if isinstance(page, int) and 1 <= page <= page_count and isinstance(is_valid, bool):
+            verdicts[page] = (is_valid, str(entry.get('reason', '')).strip())
+    return verdicts
+
+
+def validate_batch_with_gemini(items: List[Tuple[str, str]], original_claim: str) -> Dict[str, Tuple[bool, str]]:
+    """
+    Validate several (url, content) pages against the same claim with a single Gemini request.
+    Cached and obviously deleted pages are answered locally; any page the batch response
+    doesn't cover falls back to validate_page_content_with_gemini
+    Returns {url: (is_valid, explanation)}
+    """
+    needs_current_info = _needs_current_verification(original_claim)
+    claim_snippet = original_claim[:_validation_claim_chars]
+    
+    verdicts = {}
+    pending = []
+    for url, content in items:
+        snippet = content[:_validation_content_chars]
+        verdict = _deleted_post_verdict(url, snippet)
+        if verdict is None:
+            verdict = _cached_verdict(_validation_key(url, snippet, claim_snippet, needs_current_info))
+            if verdict is not None:
+                _emit("validation_cache_hit", url=url)
+        if verdict is not None:
+            verdicts[url] = verdict
+        else:
+            pending.append((url, snippet))
+    
+    # A single page doesn't benefit from batching and keeps the simpler prompt format
+    if len(pending) == 1:
+        url, snippet = pending[0]
+        verdicts[url] = validate_page_content_with_gemini(url, snippet, original_claim)
+        return verdicts
+    if not pending:
+        return verdicts
+    
+    pages = "\n".join(
+        f"PAGE {page}\nURL: {url}\nPage content (first part):\n{snippet}...\n"
+        for page, (url, snippet) in enumerate(pending, start=1)
+    )
+    prompt = f"""{_batch_validation_instructions(needs_current_info)}
+Original claim/context: {claim_snippet}...
+
+{pages}"""
+    
+    try:
+        batch_verdicts = _parse_batch_validation(get_gemini_response(prompt, temperature=0.3), len(pending))
+        _emit("validation_batch", pages=len(pending), parsed=len(batch_verdicts))
+    except Exception as e:
+        print(f"    ⚠️ Batch validation failed, validating pages individually: {str(e)[:100]}")
+        batch_verdicts = {}
+    
+    for page, (url, snippet) in enumerate(pending, start=1):
+        verdict = batch_verdicts.get(page)
+        if verdict is None:
+            verdict = validate_page_content_with_gemini(url, snippet, original_claim)
+        else:
+            _validation_cache.set(_validation_key(url, snippet, claim_snippet, needs_current_info), verdict)
+        verdicts[url] = verdict
+    return verdicts
+
+
+_link_verification_workers = 8
+_validation_batch_size = 5  # Pages judged per Gemini request
+# Note writing only needs a handful of sources; once this many are valid the rest are not checked
+_min_valid_sources = int(os.getenv("NOTE_WRITER_MIN_VALID_SOURCES", "5"))
+
+
+_min_page_content_chars = 500
+_PAGE_TITLE_RE = re.compile(r'<title[^>]*>([^<]{0,200})</title>', re.I)
+# Error page titles are usually just the error, optionally next to the site name
+# ("404 - Page Not Found | Example News"), so titles are split on separators and
+# a page is only rejected if one whole part is an error message. Headlines that
+# merely mention "404" or "not found" are left for Gemini to judge
+_TITLE_SEPARATOR_RE = re.compile(r'\s+[-|·•–—]\s+|\s*[|–—]\s*|:\s+')
+_ERROR_TITLE_RE = re.compile(
+    r'(?:(?:http\s+)?error\s*)?(?:404|410)(?:\s*error)?(?:\s*[-:]?\s*(?:(?:page\s+)?not found|gone))?'
+    r'|(?:(?:the\s+)?(?:page|file|content|article|post)\s+)?not found(?:\s*\(\s*(?:404|410)\s*\))?'
+    r'|(?:(?:this|the)\s+)?(?:page|content|article|post)\s+(?:is\s+)?(?:unavailable|no longer (?:available|exists))'
+    r'|(?:(?:this|the)\s+)?(?:page|content|article|post)\s+(?:has been|was)\s+(?:removed|deleted)'
+    r'|(?:(?:this|the)\s+)?(?:page|content|article|post)\s+(?:does not|doesn\'t)\s+exist',
+    re.I,
+)
+
+
+def _is_error_title(title: str) -> bool:
+    """True if some separator-delimited part of a page title is entirely an error message"""
+    return any(
+        _ERROR_TITLE_RE.fullmatch(part.strip().rstrip('.!'))
+        for part in _TITLE_SEPARATOR_RE.split(title)
+    )
+
+
+def _cheap_page_rejection(content: str) -> Optional[str]:
+    """
+    Heuristic checks that reject a fetched page without asking Gemini
+    Returns the reason the page is invalid, or None if it should be validated normally
+    """
+    if len(content.strip()) < _min_page_content_chars:
+        return "Page has almost no content"
+    title_match = _PAGE_TITLE_RE.search(content)
+    if title_match and _is_error_title(title_match.group(1)):
+        return f"Error page: {title_match.group(1).strip()}"
+    return None
+
+
+def _fetch_link_for_validation(url: str) -> Tuple[Optional[str], Optional[Tuple[bool, str]], List[str]]:
+    """
+    Fetch a single link ahead of validation, with lenient handling of temporary fetch errors
+    Returns (content, verdict, log_messages); verdict is set only if the link was rejected outright
+    """
+    messages = []
+    
+    # Check if we should skip this URL based on domain
+    if _should_skip_url(url):
+        messages.append(f"    ❌ Skipping low-quality domain: {url}")
+        return None, (False, "Low-quality domain"), messages
+    
+    # Fetch page content
+    content, status_code, error_msg = fetch_page_content(url)
+    
+    if content is None:
+        # For major errors like 404, 403, mark as invalid
+        if status_code in [404, 403]:
+            messages.append(f"    ❌ Failed to fetch: {error_msg}")
+            return None, (False, f"Failed to fetch: {error_msg}"), messages
+        # For other errors (timeout, connection issues), still mark as invalid but less strict
+        messages.append(f"    ⚠️ Fetch issues but trying to include: {error_msg}")
+        # Don't give up, let it be validated by Gemini with empty content
+        content = f"Unable to fetch content: {error_msg}"
+    else:
+        # Pages that are obviously useless don't need a Gemini call to reject them
+        rejection = _cheap_page_rejection(content)
+        if rejection:
+            messages.append(f"    ❌ Invalid: {rejection}")
+            return None, (False, rejection), messages
+    
+    return content, None, messages
+
+
+_TRACKING_PARAM_RE = re.compile(r'^(?:utm_\w+|fbclid|gclid)$', re.I)
+
+
+def _canonical_url(url: str) -> str:
+    """
+    Lowercase the scheme and host, drop the fragment and strip tracking parameters,
+    leaving the path and the rest of the query untouched
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query = parts.query
+    if query:
+        params = [param for param in query.split('&') if not _TRACKING_PARAM_RE.match(param.split('=', 1)[0])]
+        query = '&'.join(params)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+
 def verify_and_filter_links(search_results: str, original_query: str) -> Tuple[Optional[str], List[str]]:
     """
     Extract URLs from search results, verify they're valid and relevant, 
@@ -1174,59 +2185,87 @@ def verify_and_filter_links(search_results: str, original_query: str) -> Tuple[O
         print("  ❌ No URLs found in search results")
         return search_results, []
     
+    # Variants of the same address (host casing, fragments, tracking parameters) are fetched once
+    urls = list(dict.fromkeys(_canonical_url(url) for url in urls))
+    
+    # Most promising domains first, so they are fetched and validated first (sort is stable)
+    urls.sort(key=_url_prior, reverse=True)
+    
     print(f"  📋 Found {len(urls)} URLs to verify")
     
     valid_urls = []
+    unchecked_urls = []
     url_validation_results = {}
     
-    # Verify each URL with more lenient validation
+    # Fetch the links in parallel and validate the fetched pages in batches so one Gemini
+    # request judges several pages. A batch is sent as soon as it is full, so validation
+    # overlaps with the slower fetches instead of waiting for all of them. Gemini calls
+    # still go through the shared rate limiter, so no extra delay is needed here.
+    # Once enough sources are valid, the remaining links are neither fetched nor validated
+    fetched = {}
+    verdicts = {}
+    valid_count = 0
+    fetch_executor = ThreadPoolExecutor(max_workers=_link_verification_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=_link_verification_workers) as validation_executor:
+            future_to_url = {fetch_executor.submit(_fetch_link_for_validation, url): url for url in urls}
+            validation_futures = []
+            batch = []
+            for future in as_completed(future_to_url):
+                url = future_to_url[future]
+                content, verdict, _ = fetched[url] = future.result()
+                if verdict is None:
+                    batch.append((url, content))
+                    if len(batch) == _validation_batch_size:
+                        validation_futures.append(validation_executor.submit(validate_batch_with_gemini, batch, original_query))
+                        batch = []
+                # Count the batches that already finished, without waiting on the others
+                for validation_future in [f for f in validation_futures if f.done()]:
+                    validation_futures.remove(validation_future)
+                    batch_verdicts = validation_future.result()
+                    verdicts.update(batch_verdicts)
+                    valid_count += sum(1 for is_valid, _ in batch_verdicts.values() if is_valid)
+                if valid_count >= _min_valid_sources:
+                    break
+            else:
+                if batch:
+                    validation_futures.append(validation_executor.submit(validate_batch_with_gemini, batch, original_query))
+            for validation_future in validation_futures:
+                verdicts.update(validation_future.result())
+    finally:
+        # Fetches still queued are dropped; running ones finish in the background
+        fetch_executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Report in processing order once everything has finished
     for i, url in enumerate(urls):
         print(f"  🔗 Checking URL {i+1}/{len(urls)}: {url}")
-        
-        # Check if we should skip this URL based on domain
-        if _should_skip_url(url):
-            print(f"    ❌ Skipping low-quality domain: {url}")
-            url_validation_results[url] = (False, "Low-quality domain")
+        if url not in verdicts and (url not in fetched or fetched[url][1] is None):
+            # Not known to be bad, so kept apart from the invalid links
+            print(f"    ⏭️ Not checked: {_min_valid_sources} valid sources already found")
+            unchecked_urls.append(url)
             continue
-        
-        # Add rate limiting between requests
-        if i > 0:
-            print(f"Rate limiting: waiting 2.4 seconds...")
-            time.sleep(2.4)
-        
-        # Fetch page content
-        content, status_code, error_msg = fetch_page_content(url)
-        
-        if content is None:
-            # For major errors like 404, 403, mark as invalid
-            if status_code in [404, 403]:
-                print(f"    ❌ Failed to fetch: {error_msg}")
-                url_validation_results[url] = (False, f"Failed to fetch: {error_msg}")
-                continue
-            else:
-                # For other errors (timeout, connection issues), still mark as invalid but less strict
-                print(f"    ⚠️ Fetch issues but trying to include: {error_msg}")
-                # Don't continue, let it be validated by Gemini with empty content
-                content = f"Unable to fetch content: {error_msg}"
-        
-        # Only validate with Gemini if we successfully fetched content OR if it's a fetch error that might be temporary
-        is_valid, explanation = validate_page_content_with_gemini(url, content or "", original_query)
-        
+        _, verdict, messages = fetched[url]
+        for message in messages:
+            print(message)
+        if verdict is not None:
+            is_valid, explanation = verdict
+        else:
+            is_valid, explanation = verdicts[url]
+            print(f"    ✅ Valid: {explanation}" if is_valid else f"    ❌ Invalid: {explanation}")
         if is_valid:
-            print(f"    ✅ Valid: {explanation}")
             valid_urls.append(url)
-            url_validation_results[url] = (True, explanation)
-        else:
-            print(f"    ❌ Invalid: {explanation}")
-            url_validation_results[url] = (False, explanation)
+        url_validation_results[url] = (is_valid, explanation)
     
-    print(f"📊 Link verification complete: {len(valid_urls)}/{len(urls)} URLs are valid")
+    print(f"📊 Link verification complete: {len(valid_urls)}/{len(url_validation_results)} checked URLs are valid"
+          + (f", {len(unchecked_urls)} not checked" if unchecked_urls else ""))
     
     # Show detailed validation results for debugging
     print("📋 Detailed validation results:")
     for url, (is_valid, explanation) in url_validation_results.items():
         status_icon = "✅" if is_valid else "❌"
         print(f"  {status_icon} {url}: {explanation}")
+    for url in unchecked_urls:
+        print(f"  ⏭️ {url}: Not checked, enough valid sources already found")
     
     # Filter the search results to only include valid URLs
     if len(valid_urls) == 0:
@@ -1237,10 +2276,17 @@ def verify_and_filter_links(search_results: str, original_query: str) -> Tuple[O
     print(f"✅ Found {len(valid_urls)} valid sources - proceeding with note generation")
     print(f"🎯 Valid sources: {', '.join(valid_urls)}")
     
-    # Create a filtered version that emphasizes only valid sources
+    # Create a filtered version that emphasizes only valid sources. Links skipped after the
+    # early stop are listed on their own, so they aren't mistaken for broken ones
+    unchecked_section = ""
+    if unchecked_urls:
+        unchecked_section = f"""
+NOT CHECKED (enough valid sources were already found; these are not known to be broken, but do not cite them):
+{chr(10).join(f"- {url}" for url in unchecked_urls)}
+"""
     filtered_results = f"""VERIFIED VALID SOURCES (ONLY USE THESE):
 {chr(10).join(f"✅ {url}" for url in valid_urls)}
-
+{unchecked_section}
 ORIGINAL SEARCH RESULTS:
 {search_results}
 
@@ -1251,6 +2297,29 @@ If you reference information in your note, only cite URLs from the VERIFIED VALI
     return filtered_results, valid_urls
 
 
+# Hosts every search touches; warming them moves DNS + TLS setup off the first real request
+_warm_hosts = sorted({urlparse(feed_url).netloc for feed_url in _rss_feeds} | {"news.google.com"})
+
+
+def _warm_connections():
+    """
+    Open a pooled connection to each known host so later requests reuse it
+    """
+    def warm(host: str):
+        try:
+            _http_session.head(f"https://{host}/", timeout=2, allow_redirects=False)
+        except Exception:
+            pass  # Warm-up is best effort only
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(warm, _warm_hosts))
+
+
+# Opt-in so tests and CI never make surprise network calls at import time
+if os.getenv("NOTE_WRITER_WARM_CONNECTIONS") == "1":
+    threading.Thread(target=_warm_connections, name="warm-connections", daemon=True).start()
+
+
 if __name__ == "__main__":
     dotenv.load_dotenv()
     print(
@@ -1,27 +1,69 @@
 import json
 import re
-from typing import List
+from typing import List, Optional, Tuple
 
 from data_models import MisleadingTag, Post
-from note_writer.llm_util import get_gemini_response
+from note_writer.llm_util import ResultCache, get_gemini_response
+
+# Prefer the C-backed orjson when it is installed; fall back to the stdlib json module.
+# orjson's decode error subclasses json.JSONDecodeError, so the handlers below cover both
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Structured output: Gemini must answer with a JSON object listing known tags only,
+# so the answer parses on the first try instead of needing regex recovery and retries
+_MISLEADING_TAGS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "misleading_tags": {
+            "type": "array",
+            "items": {"type": "string", "enum": [tag.value for tag in MisleadingTag]},
+        },
+    },
+    "required": ["misleading_tags"],
+}
+
+
+# Tags for a post and note pair don't change, so a replayed or rerun post reuses them.
+# Keyed on the post's content rather than its id, so reposts of the same text share them.
+# With NOTE_WRITER_HTTP_CACHE=1 they are kept on disk for a week
+_tags_cache = ResultCache("misleading_tags", 86400, persist_ttl_seconds=7 * 86400)  # 1 day
 
 
 def get_misleading_tags(
     post: Post, images_summary: str, note_text: str, retries: int = 3
 ) -> List[MisleadingTag]:
+    tags_key = _tags_cache.key(post.text, images_summary, note_text)
+    cached_tags = _tags_cache.get(tags_key)
+    if cached_tags is not None:
+        return [MisleadingTag(tag) for tag in cached_tags]
+    
     misleading_why_tags_prompt = _get_prompt_for_misleading_why_tags(
         post, images_summary, note_text
     )
+    first_attempt = True
     while retries > 0:
         try:
-            misleading_why_tags_str = get_gemini_response(misleading_why_tags_prompt)
+            # A retry must not get the cached answer that just failed to parse
+            misleading_why_tags_str = get_gemini_response(
+                misleading_why_tags_prompt, response_schema=_MISLEADING_TAGS_SCHEMA,
+                bypass_cache=not first_attempt,
+            )
+            first_attempt = False
             
-            # Try to extract JSON from the response more robustly
+            # Schema-constrained answers are plain JSON; the extraction below only
+            # has extra work to do for the rare answer that doesn't follow the schema
             json_data = _extract_json_from_response(misleading_why_tags_str)
             
             if json_data and "misleading_tags" in json_data:
-                misleading_why_tags = json_data["misleading_tags"]
-                return [MisleadingTag(tag) for tag in misleading_why_tags]
+                misleading_why_tags = [MisleadingTag(tag) for tag in json_data["misleading_tags"]]
+                # Only tags the model actually chose are cached, never the fallback below
+                _tags_cache.set(tags_key, [tag.value for tag in misleading_why_tags])
+                return misleading_why_tags
             else:
                 raise ValueError(f"No valid JSON found in response: {misleading_why_tags_str}")
                 
@@ -36,7 +78,59 @@ def get_misleading_tags(
     return [MisleadingTag("missing_important_context")]
 
 
-def _extract_json_from_response(response: str) -> dict:
+# Final "MISLEADING TAGS: [...]" line the note-writing prompt asks for, so the tags come
+# back with the note instead of costing a second Gemini call
+NOTE_TAG_OPTIONS = ", ".join(tag.value for tag in MisleadingTag)
+_NOTE_TAGS_LINE_RE = re.compile(r'^[ \t*_-]*MISLEADING TAGS[ \t*_]*:[ \t*_]*(.*)$', re.I | re.M)
+
+
+def split_note_and_tags(note_text: str) -> Tuple[str, List[MisleadingTag]]:
+    """
+    Remove the trailing tags line from a written note and parse it.
+    Returns (note without the tags line, tags); tags is empty if the line is missing or unusable,
+    and unknown tag names are ignored
+    """
+    matches = list(_NOTE_TAGS_LINE_RE.finditer(note_text))
+    if not matches:
+        return note_text, []
+    match = matches[-1]
+    # The tags line must never end up in the submitted note, even if it doesn't parse
+    note = (note_text[:match.start()] + note_text[match.end():]).strip()
+    try:
+        tag_names = _json_loads(match.group(1).strip().strip('`'))
+    except json.JSONDecodeError:
+        return note, []
+    if not isinstance(tag_names, list):
+        return note, []
+    known_tags = {tag.value for tag in MisleadingTag}
+    tags = [MisleadingTag(name) for name in tag_names if isinstance(name, str) and name in known_tags]
+    return note, list(dict.fromkeys(tags))
+
+
+# JSON object holding the tags, possibly surrounded by other text, or failing that just the array
+_TAGS_OBJECT_RE = re.compile(r'\{[^{}]*"misleading_tags"[^{}]*\[[^\]]*\][^{}]*\}', re.DOTALL)
+_TAGS_ARRAY_RE = re.compile(r'"misleading_tags":\s*(\[[^\]]*\])')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _first_tags_object(response: str) -> Optional[dict]:
+    """
+    Decode JSON objects in place starting at each '{' and return the first one holding
+    the tags, so JSON wrapped in prose or code fences is read without any regex
+    """
+    start = response.find('{')
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(response, start)
+            if isinstance(value, dict) and isinstance(value.get("misleading_tags"), list):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = response.find('{', start + 1)
+    return None
+
+
+def _extract_json_from_response(response: str) -> Optional[dict]:
     """Extract JSON from model response, handling various formats"""
     if not response or not response.strip():
         return None
@@ -45,26 +139,33 @@ def _extract_json_from_response(response: str) -> dict:
     
     # Try direct JSON parsing first
     try:
-        return json.loads(response)
+        return _json_loads(response)
     except json.JSONDecodeError:
         pass
     
+    # Every fallback below looks for the key, so without it there is nothing to find
+    if '"misleading_tags"' not in response:
+        return None
+    
+    # Fast path: the JSON object embedded in the surrounding text
+    json_data = _first_tags_object(response)
+    if json_data is not None:
+        return json_data
+    
     # Try to find JSON within the response using regex
-    json_pattern = r'\{[^{}]*"misleading_tags"[^{}]*\[[^\]]*\][^{}]*\}'
-    matches = re.findall(json_pattern, response, re.DOTALL)
+    matches = _TAGS_OBJECT_RE.findall(response)
     
     for match in matches:
         try:
-            return json.loads(match)
+            return _json_loads(match)
         except json.JSONDecodeError:
             continue
     
     # Try to find just the array part
-    array_pattern = r'"misleading_tags":\s*(\[[^\]]*\])'
-    match = re.search(array_pattern, response)
+    match = _TAGS_ARRAY_RE.search(response)
     if match:
         try:
-            tags_array = json.loads(match.group(1))
+            tags_array = _json_loads(match.group(1))
             return {"misleading_tags": tags_array}
         except json.JSONDecodeError:
             pass
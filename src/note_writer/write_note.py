@@ -1,30 +1,31 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 from data_models import NoteResult, Post, ProposedMisleadingNote
 from note_writer.llm_util import (
     get_gemini_search_response,
-    get_gemini_response,
+    get_gemini_response_streamed,
     gemini_describe_image,
+    search_for_prompt,
     verify_and_filter_links,
 )
-from note_writer.misleading_tags import get_misleading_tags
+from note_writer.misleading_tags import NOTE_TAG_OPTIONS, get_misleading_tags, split_note_and_tags
+
+
+# Either a URL that already has a scheme of any kind or case (group 1, left alone) or a domain.com
+# style URL without one (group 2). Matching full URLs first keeps their hosts from being seen as bare domains
+_DOMAIN_URL_RE = re.compile(
+    r'([a-zA-Z][a-zA-Z0-9+.-]*://\S*)'
+    r'|(\b(?:[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.)+[a-zA-Z]{2,}(?![a-zA-Z]*://)(?:/[^\s]*)?)'
+)
 
 
 def _ensure_urls_have_protocol(text: str) -> str:
     """Ensure all URLs in the text have https:// prefix for API compliance"""
-    # Simple pattern to find domain.com style URLs without protocol
-    url_pattern = r'\b([a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.)+[a-zA-Z]{2,}(?:/[^\s]*)?'
+    # Every domain contains a dot, so text without one has nothing to fix
+    if '.' not in text:
+        return text
     
-    def add_https_if_needed(match):
-        url = match.group(0)
-        # Check if the URL already has a protocol by looking at the text before it
-        start_pos = match.start()
-        # Look for protocol before the match
-        before_match = text[max(0, start_pos-10):start_pos]
-        if before_match.endswith('://') or before_match.endswith('http://') or before_match.endswith('https://'):
-            return url
-        return f'https://{url}'
-    
-    return re.sub(url_pattern, add_https_if_needed, text)
+    return _DOMAIN_URL_RE.sub(lambda match: match.group(1) or f'https://{match.group(2)}', text)
 
 def _get_prompt_for_note_writing(post: Post, images_summary: str, search_results: str):
     return f"""You will be given a post on X (formerly Twitter), a summary of any images, and live search results. 
@@ -43,6 +44,9 @@ def _get_prompt_for_note_writing(post: Post, images_summary: str, search_results
         - Use ONLY recent, non-partisan sources that would be found trustworthy across political perspectives.
         - CRITICAL: Only cite URLs that are marked as "VERIFIED VALID SOURCES" in the search results. Do not use any broken, 404, or invalid sources.
         - Ensure all factual claims in your note are current and accurate as of today's date (2025).
+        - After the note, add one final line listing which tags apply to the post (at least one), exactly in this format:
+          MISLEADING TAGS: ["factual_error", "missing_important_context"]
+          Tags to choose from: {NOTE_TAG_OPTIONS}
         - If the post is not misleading or does not contain concrete, fact-checkable claims, respond with:
         - "NO NOTE NEEDED."
         - If the post may be misleading but the available evidence is outdated, broken (e.g. 404 links), or insufficient to confidently write a correction, respond with:
@@ -123,29 +127,62 @@ def _get_prompt_for_live_search(post: Post, images_summary: str = ""):
         ```
     """
 
+# Links, mentions and a leading retweet marker say nothing checkable on their own
+_NON_CLAIM_TEXT_RE = re.compile(r'^\s*RT\b:?|@\w+|https?://\S+', re.I)
+
+
+def _has_no_checkable_text(post: Post) -> bool:
+    """
+    Cheap pre-filter for posts with no words or numbers besides links and mentions
+    (e.g. only emoji or punctuation). Posts with media are never filtered, since the
+    claim may be in the images; anything with actual text is left to Gemini
+    """
+    if post.media:
+        return False
+    text = _NON_CLAIM_TEXT_RE.sub('', post.text or "")
+    return not any(char.isalnum() for char in text)
+
+
+_REFUSAL_MARKERS = ("NO NOTE NEEDED", "NOT ENOUGH EVIDENCE TO WRITE A GOOD COMMUNITY NOTE")
+# All refusal markers in one pattern, so a note is scanned once however many markers there are
+_REFUSAL_RE = re.compile('|'.join(map(re.escape, _REFUSAL_MARKERS)))
+
+# Images of one post are described in parallel; the shared rate limiter still paces the calls
+_image_description_workers = 4
+
+
+def _describe_image_for_summary(index: int, url: str) -> str:
+    if not url:
+        return f"Image {index}: [No URL available for image]\n\n"
+    try:
+        image_description = gemini_describe_image(url)
+        if image_description and image_description.strip():
+            return f"Image {index}: {image_description.strip()}\n\n"
+        return f"Image {index}: [Unable to analyze image]\n\n"
+    except Exception as e:
+        return f"Image {index}: [Error analyzing image: {str(e)[:100]}]\n\n"
+
+
 def _summarize_images(post: Post) -> str:
     """
     Summarize images, if they exist. Abort if video or other unsupported media type.
     """
-    images_summary = ""
+    # Check every media item first so an unsupported post aborts before any Gemini call
+    photos = []
     for i, media in enumerate(post.media):
         if media.media_type == "photo":
-            if not media.url:
-                images_summary += f"Image {i}: [No URL available for image]\n\n"
-                continue
-            try:
-                image_description = gemini_describe_image(media.url)
-                if image_description and image_description.strip():
-                    images_summary += f"Image {i}: {image_description.strip()}\n\n"
-                else:
-                    images_summary += f"Image {i}: [Unable to analyze image]\n\n"
-            except Exception as e:
-                images_summary += f"Image {i}: [Error analyzing image: {str(e)[:100]}]\n\n"
+            photos.append((i, media.url))
         elif media.media_type == "video":
             raise ValueError("Video not supported yet")
         else:
             raise ValueError(f"Unsupported media type: {media.media_type}")
-    return images_summary
+    
+    if len(photos) <= 1:
+        return "".join(_describe_image_for_summary(i, url) for i, url in photos)
+    
+    with ThreadPoolExecutor(max_workers=min(len(photos), _image_description_workers)) as executor:
+        # map keeps the summaries in the original media order
+        return "".join(executor.map(lambda photo: _describe_image_for_summary(*photo), photos))
 
 
 def research_post_and_write_note(
@@ -154,14 +191,26 @@ def research_post_and_write_note(
     # Check if post has meaningful content (text or media)
     if (not post.text or not post.text.strip()) and (not post.media or len(post.media) == 0):
         return NoteResult(post=post, refusal="NO NOTE NEEDED: Post appears to be empty with no text content or media.")
+    if _has_no_checkable_text(post):
+        # Not a "NO NOTE NEEDED" refusal: those are final and the post is never looked at again
+        return NoteResult(post=post, refusal="SKIPPED: Post has no text to fact-check besides links, mentions or symbols.")
     
     try:
-        images_summary = _summarize_images(post)
+        if post.media and all(media.media_type == "photo" for media in post.media):
+            # The web search query comes from the post text alone, so it runs while the
+            # photos are being described instead of after them
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                web_results_future = executor.submit(search_for_prompt, _get_prompt_for_live_search(post))
+                images_summary = _summarize_images(post)
+                web_results = web_results_future.result()
+        else:
+            images_summary = _summarize_images(post)
+            web_results = None
     except ValueError as e:
         return NoteResult(post=post, error=str(e))
 
     search_prompt = _get_prompt_for_live_search(post, images_summary)
-    search_results = get_gemini_search_response(search_prompt)
+    search_results = get_gemini_search_response(search_prompt, web_results=web_results)
     
     # Handle case where search results are None
     if search_results is None:
@@ -185,21 +234,24 @@ def research_post_and_write_note(
     # Use filtered search results for note writing
     note_prompt = _get_prompt_for_note_writing(post, images_summary, filtered_search_results)
 
-    note_or_refusal_str = get_gemini_response(note_prompt)
+    # Refusals open the answer, so the rest of the generation is skipped once one shows up
+    note_or_refusal_str = get_gemini_response_streamed(note_prompt, _REFUSAL_MARKERS)
 
     # Handle case where Gemini API returns None due to errors
     if note_or_refusal_str is None:
         return NoteResult(post=post, error="Failed to get response from Gemini API")
 
-    if ("NO NOTE NEEDED" in note_or_refusal_str) or (
-        "NOT ENOUGH EVIDENCE TO WRITE A GOOD COMMUNITY NOTE" in note_or_refusal_str
-    ):
+    if _REFUSAL_RE.search(note_or_refusal_str):
         return NoteResult(post=post, refusal=note_or_refusal_str)
 
+    # The tags normally come back on the note's last line; classify separately only without them
+    note_text, misleading_tags = split_note_and_tags(note_or_refusal_str)
+
     # Ensure URLs in the note have proper protocol
-    formatted_note_text = _ensure_urls_have_protocol(note_or_refusal_str)
+    formatted_note_text = _ensure_urls_have_protocol(note_text)
 
-    misleading_tags = get_misleading_tags(post, images_summary, formatted_note_text)
+    if not misleading_tags:
+        misleading_tags = get_misleading_tags(post, images_summary, formatted_note_text)
 
     return NoteResult(
         post=post,
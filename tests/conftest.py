@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules are imported the way main.py sees them, with src/ on the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# The Gemini client is created at import time and needs a key, but tests never call the API
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
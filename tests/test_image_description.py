@@ -0,0 +1,33 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from note_writer import llm_util
+
+
+def test_shared_image_is_described_once_and_its_lock_released(monkeypatch):
+    calls = []
+    
+    def generate_content(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.1)  # Long enough for the other callers to queue on the lock
+        return SimpleNamespace(text="A chart of election results")
+    
+    monkeypatch.setattr(llm_util, "_download_image_part", lambda url: "image")
+    monkeypatch.setattr(llm_util, "_rate_limit", lambda: None)
+    monkeypatch.setattr(llm_util.client.models, "generate_content", generate_content)
+    monkeypatch.setattr(llm_util, "_image_description_cache", llm_util._TTLCache(16, 3600))
+    
+    descriptions = []
+    threads = [
+        threading.Thread(target=lambda: descriptions.append(llm_util.gemini_describe_image("https://img.example.com/1.jpg")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert descriptions == ["A chart of election results"] * 4
+    assert len(calls) == 1
+    assert llm_util._image_description_locks == {}
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from note_writer import llm_util
+
+
+@pytest.mark.parametrize("title", [
+    "404",
+    "404 Not Found",
+    "404 - Page Not Found | BBC",
+    "Page not found – The Guardian",
+    "Error 404: Page not found",
+    "410 Gone",
+    "This page is no longer available",
+    "Article has been removed | Example News",
+])
+def test_error_page_titles_are_rejected(title):
+    assert llm_util._is_error_title(title)
+
+
+@pytest.mark.parametrize("title", [
+    "Hacker group 404 claims responsibility for outage",
+    "Evidence not found for claim about vaccines",
+    "Route 404 reopens after crash | Local News",
+    "Study: cure not found yet",
+    "The content was removed after complaints, says CEO",
+])
+def test_headlines_mentioning_errors_are_kept(title):
+    assert not llm_util._is_error_title(title)
+
+
+def test_links_skipped_after_early_stop_are_not_listed_as_invalid(monkeypatch):
+    urls = [f"https://source{i}.example.org/article" for i in range(6)]
+    
+    def fetch(url):
+        if url not in urls[:2]:
+            time.sleep(0.3)  # The first two are validated before the others arrive
+        return "page content", None, []
+    
+    monkeypatch.setattr(llm_util, "_fetch_link_for_validation", fetch)
+    monkeypatch.setattr(llm_util, "validate_batch_with_gemini",
+                        lambda batch, query: {url: (True, "Supports the claim") for url, _ in batch})
+    monkeypatch.setattr(llm_util, "_min_valid_sources", 2)
+    monkeypatch.setattr(llm_util, "_validation_batch_size", 2)
+    
+    filtered, valid_urls = llm_util.verify_and_filter_links("Sources: " + " ".join(urls), "claim")
+    
+    assert valid_urls == urls[:2]
+    unchecked_section = filtered.split("NOT CHECKED", 1)[1].split("ORIGINAL SEARCH RESULTS", 1)[0]
+    assert all(url in unchecked_section for url in urls[2:])
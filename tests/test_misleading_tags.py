@@ -0,0 +1,24 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from data_models import MisleadingTag, Post
+from note_writer import llm_util, misleading_tags
+
+
+def test_retry_after_unparseable_answer_asks_gemini_again(monkeypatch):
+    answers = iter(["not json at all", '{"misleading_tags": ["factual_error"]}'])
+    calls = []
+    
+    def generate_content(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(text=next(answers))
+    
+    monkeypatch.setattr(llm_util.client.models, "generate_content", generate_content)
+    monkeypatch.setattr(llm_util, "_response_cache", llm_util._TTLCache(16, 600))
+    monkeypatch.setattr(misleading_tags, "_tags_cache", llm_util.ResultCache("misleading_tags", 600))
+    post = Post(post_id=1, author_id="1", created_at=datetime(2025, 1, 1), text="Claim", media=[])
+    
+    tags = misleading_tags.get_misleading_tags(post, "", "Note text https://example.com")
+    
+    assert tags == [MisleadingTag.factual_error]
+    assert len(calls) == 2
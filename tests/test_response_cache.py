@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from note_writer import disk_cache, llm_util
+
+
+def _new_run_cache():
+    # What the module builds at import time with NOTE_WRITER_HTTP_CACHE=1
+    return llm_util._TTLCache(16, 600, backing=disk_cache.DiskCache("gemini_responses", 7 * 86400))
+
+
+def test_low_temperature_response_is_read_back_in_the_next_run(monkeypatch, tmp_path):
+    monkeypatch.setattr(disk_cache, "_cache_dir", str(tmp_path))
+    monkeypatch.setattr(llm_util, "_rate_limit", lambda: None)
+    
+    # First run: the answer comes from Gemini
+    monkeypatch.setattr(llm_util, "_response_cache", _new_run_cache())
+    monkeypatch.setattr(llm_util.client.models, "generate_content",
+                        lambda **kwargs: SimpleNamespace(text="VALID: page supports the claim"))
+    assert llm_util.get_gemini_response("validate this page", temperature=0.3) == "VALID: page supports the claim"
+    
+    # Next run: empty memory cache, and Gemini must not be called again
+    def no_gemini(**kwargs):
+        raise AssertionError("Gemini called although the answer was persisted")
+    monkeypatch.setattr(llm_util, "_response_cache", _new_run_cache())
+    monkeypatch.setattr(llm_util.client.models, "generate_content", no_gemini)
+    assert llm_util.get_gemini_response("validate this page", temperature=0.3) == "VALID: page supports the claim"
+
+
+def test_high_temperature_response_is_not_persisted(monkeypatch, tmp_path):
+    monkeypatch.setattr(disk_cache, "_cache_dir", str(tmp_path))
+    backing = disk_cache.DiskCache("gemini_responses", 7 * 86400)
+    monkeypatch.setattr(llm_util, "_response_cache", llm_util._TTLCache(16, 600, backing=backing))
+    llm_util._store_response("key", 0.8, "creative answer")
+    assert backing.get("key") is None
+
+
+def test_streamed_refusal_stops_the_stream_and_is_not_cached(monkeypatch):
+    monkeypatch.setattr(llm_util, "_rate_limit", lambda: None)
+    monkeypatch.setattr(llm_util, "_response_cache", llm_util._TTLCache(16, 600))
+    read = []
+    closed = []
+    
+    def generate_content_stream(**kwargs):
+        try:
+            for text in ["NO NOTE NEEDED: the post", " is accurate", " and more"]:
+                read.append(text)
+                yield SimpleNamespace(text=text)
+        finally:
+            closed.append(True)
+    
+    monkeypatch.setattr(llm_util.client.models, "generate_content_stream", generate_content_stream)
+    
+    answer = llm_util.get_gemini_response_streamed("write a note", ("NO NOTE NEEDED",))
+    
+    assert answer == "NO NOTE NEEDED: the post"
+    assert read == ["NO NOTE NEEDED: the post"]
+    assert closed == [True]
+    assert llm_util._response_cache.get(llm_util._request_key(llm_util._gemini_model, 0.8, "write a note")) is None
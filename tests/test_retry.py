@@ -0,0 +1,30 @@
+from note_writer import llm_util
+
+
+def _failing_then_ok(failures: int, error: str):
+    attempts = []
+    
+    def api_call():
+        attempts.append(1)
+        if len(attempts) <= failures:
+            raise Exception(error)
+        return "ok"
+    return api_call, attempts
+
+
+def test_every_attempt_takes_a_rate_limit_token(monkeypatch):
+    tokens = []
+    monkeypatch.setattr(llm_util, "_rate_limit", lambda: tokens.append(1))
+    monkeypatch.setattr(llm_util.time, "sleep", lambda seconds: None)
+    api_call, attempts = _failing_then_ok(2, "503 UNAVAILABLE")
+    
+    assert llm_util._retry_with_backoff(api_call, max_retries=3) == "ok"
+    assert len(attempts) == 3
+    assert len(tokens) == 3
+
+
+def test_backoff_never_retries_right_away():
+    for attempt in range(4):
+        ceiling = min(120, 10 * 2 ** attempt)
+        for _ in range(200):
+            assert ceiling / 2 <= llm_util._backoff(attempt, 10, 120) <= ceiling
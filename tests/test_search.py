@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from note_writer import llm_util
+
+
+def _results(engine: str) -> str:
+    return f"RECENT WEB SEARCH RESULTS ({engine}):\n\nResult 1:\nTitle: t\nURL: https://example.com\n"
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Replace the search engines with fakes; each entry is (delay, result or exception)"""
+    behaviour = {}
+    calls = []
+    
+    def fake(name):
+        def search(query, max_results=10):
+            calls.append(name)
+            delay, outcome = behaviour[name]
+            time.sleep(delay)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return search
+    
+    monkeypatch.setattr(llm_util, "_search_with_yagooglesearch", fake("google"))
+    monkeypatch.setattr(llm_util, "_search_with_rss_feeds", fake("rss"))
+    monkeypatch.setattr(llm_util, "_search_with_news_scraper", fake("news"))
+    monkeypatch.setattr(llm_util, "_engine_stats", {})
+    monkeypatch.setattr(llm_util, "_engine_time_budget_seconds", 0.3)
+    monkeypatch.setattr(llm_util, "_search_cache", llm_util._TTLCache(16, 60))
+    return behaviour, calls
+
+
+def test_google_results_win_over_faster_engines(engines):
+    behaviour, calls = engines
+    behaviour.update(google=(0.1, _results("google")), rss=(0, _results("rss")), news=(0, _results("news")))
+    assert "(google)" in llm_util.search_web_for_recent_info("query one")
+    assert calls == ["google"]
+
+
+def test_failed_engine_falls_back_in_order(engines):
+    behaviour, calls = engines
+    behaviour.update(google=(0, "Google search rate limited or no results found"),
+                     rss=(0, RuntimeError("feeds down")), news=(0, _results("news")))
+    assert "(news)" in llm_util.search_web_for_recent_info("query two")
+    assert calls == ["google", "rss", "news"]
+
+
+def test_slow_engine_is_hedged_and_abandoned_without_blocking_exit(engines):
+    behaviour, calls = engines
+    behaviour.update(google=(5, _results("google")), rss=(0, _results("rss")), news=(0, _results("news")))
+    start = time.monotonic()
+    assert "(rss)" in llm_util.search_web_for_recent_info("query three")
+    assert time.monotonic() - start < 2
+    # The abandoned Google search must not keep the interpreter alive
+    assert all(thread.daemon for thread in threading.enumerate() if thread.name.startswith("search-"))
+
+
+def test_http_retries_never_wait_on_rate_limits():
+    retry = llm_util._http_adapter.max_retries
+    assert 429 not in retry.status_forcelist
+    assert not retry.respect_retry_after_header
+
+
+@pytest.mark.parametrize("text", ["elections are coming", "Laws changed", "he voted", "It is NOW official"])
+def test_current_keywords_match_whole_words_and_inflections(text):
+    assert llm_util._needs_current_verification(text)
+
+
+@pytest.mark.parametrize("text", ["nowhere", "a newspaper", "the lawn", "a billion", "newly", "I know"])
+def test_current_keywords_ignore_longer_words(text):
+    assert not llm_util._needs_current_verification(text)
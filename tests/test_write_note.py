@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from data_models import Media, Post
+from note_writer import write_note
+
+
+def _post(text: str, media=None) -> Post:
+    return Post(post_id=1, author_id="1", created_at=datetime(2025, 1, 1), text=text, media=media or [])
+
+
+@pytest.mark.parametrize("text", [
+    "Vaccines cause autism",
+    "Election stolen",
+    "Moon landing faked",
+    "Drinking bleach cures covid",
+    "Ukraine invaded Russia",
+    "Climate change hoax",
+    "Taxes doubled under Obama",
+    "@user vaccines cause autism",
+    "RT @user: Election stolen",
+    "Moon landing faked https://t.co/abc123",
+])
+def test_short_claims_are_not_prefiltered(text):
+    assert not write_note._has_no_checkable_text(_post(text))
+
+
+@pytest.mark.parametrize("text", ["🔥🔥🔥", "@user @other", "RT @user: https://t.co/abc123 !!", "..."])
+def test_posts_without_text_are_prefiltered(text):
+    assert write_note._has_no_checkable_text(_post(text))
+
+
+def test_posts_with_media_are_never_prefiltered():
+    assert not write_note._has_no_checkable_text(_post("🔥", [Media(media_key="1", media_type="photo")]))
+
+
+def test_prefiltered_post_is_not_a_final_refusal():
+    result = write_note.research_post_and_write_note(_post("@user 👀"))
+    # main._worker marks "NO NOTE NEEDED" posts as processed for good
+    assert result.refusal and "NO NOTE NEEDED" not in result.refusal
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("See example.com/a for details", "See https://example.com/a for details"),
+    ("Source: https://example.com/a", "Source: https://example.com/a"),
+    ("HTTPS://CAPS.com/x", "HTTPS://CAPS.com/x"),
+    ("ftp://foo.com", "ftp://foo.com"),
+    ("Mirror at FTP://files.example.org/a and docs.example.org", "Mirror at FTP://files.example.org/a and https://docs.example.org"),
+])
+def test_urls_get_a_protocol_only_when_missing(text, expected):
+    assert write_note._ensure_urls_have_protocol(text) == expected